@@ -0,0 +1,13 @@
+"""
+Make the repository root importable for scripts run as `python scripts/<name>.py`.
+
+Import this module before any `src.*` import. After `pip install -e .` the
+repository root is importable without it.
+"""
+import os
+import sys
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
@@ -0,0 +1,11 @@
+"""
+Logging level for scripts, taken from the LOG_LEVEL environment variable.
+"""
+import logging
+import os
+
+
+def log_level() -> int:
+    """Level named by LOG_LEVEL; INFO if unset or not a level name."""
+    level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').strip().upper())
+    return level if isinstance(level, int) else logging.INFO
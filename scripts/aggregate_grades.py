@@ -7,32 +7,31 @@ assignment containing all students' grades.
 """
 
 import argparse
-import json
 import csv
+import os
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 import sys
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
 
+from src.report_json import loads_report
+from src.student_ids import get_student_email_from_id
 
-def get_student_email_from_id(student_id: str) -> str:
-    """
-    Convert student_id back to email format.
+# Output buffer size for aggregated CSV files
+CSV_BUFFER_SIZE = 1 << 20
 
-    Args:
-        student_id: Student identifier (email with @ and . replaced)
+# Maximum number of threads used to scan artifact directories
+MAX_SCAN_WORKERS = 16
 
-    Returns:
-        Student email address
-    """
-    # Reverse the transformation done in classroom_client.py:
-    # email.replace('@', '_at_').replace('.', '_')
-    email = student_id.replace('_at_', '@')
-    email = email.replace('_', '.')
-    return email
+# Print a progress line every N processed reports
+PROGRESS_EVERY = 1000
+
+# Prefix of grading report artifact names
+ARTIFACT_PREFIX = 'grading-report-'
 
 
 def extract_grade_from_report(report: dict) -> tuple:
@@ -73,19 +72,64 @@ def parse_artifact_name(artifact_name: str) -> tuple:
     Returns:
         Tuple of (student_id, assignment_id) or (None, None) if parsing fails
     """
-    if not artifact_name.startswith('grading-report-'):
+    if not artifact_name.startswith(ARTIFACT_PREFIX):
         return (None, None)
 
-    # Remove 'grading-report-' prefix
-    remainder = artifact_name[15:]
-
     # Split by last occurrence of '-' to separate student_id and assignment_id
     # (student_id may contain dashes)
-    parts = remainder.rsplit('-', 1)
-    if len(parts) != 2:
+    student_id, sep, assignment_id = artifact_name[len(ARTIFACT_PREFIX):].rpartition('-')
+    if not sep:
         return (None, None)
 
-    return (parts[0], parts[1])
+    return (student_id, assignment_id)
+
+
+def process_artifact(artifact_dir: Path, assignment_filter: str = None):
+    """
+    Extract the grade entry from a single artifact directory.
+
+    Args:
+        artifact_dir: Artifact directory containing grade_report.json
+        assignment_filter: Optional assignment ID to filter by
+
+    Returns:
+        Tuple of (assignment_id, grade_entry, message). grade_entry is None
+        if the artifact was skipped, with message explaining why; message is
+        None on success.
+        Returns None if the artifact is excluded by assignment_filter.
+    """
+    # Parse artifact name to get student_id and assignment_id
+    student_id, assignment_id = parse_artifact_name(artifact_dir.name)
+
+    if not student_id or not assignment_id:
+        return (None, None, f"⚠️  Skipping {artifact_dir.name}: couldn't parse artifact name")
+
+    # Filter by assignment if specified
+    if assignment_filter and assignment_id != assignment_filter:
+        return None
+
+    # Find the grade_report.json file
+    report_file = artifact_dir / 'grade_report.json'
+    if not report_file.exists():
+        return (assignment_id, None, f"⚠️  Skipping {artifact_dir.name}: no grade_report.json found")
+
+    # Read the report
+    try:
+        report = loads_report(report_file.read_bytes())
+    except Exception as e:
+        return (assignment_id, None, f"❌ Error reading {report_file}: {e}")
+
+    # Extract grade
+    grade_value, max_points = extract_grade_from_report(report)
+    student_email = get_student_email_from_id(student_id)
+
+    grade_entry = {
+        'email': student_email,
+        'grade': grade_value,
+        'max_points': max_points,
+        'student_id': student_id
+    }
+    return (assignment_id, grade_entry, None)
 
 
 def aggregate_grades(artifacts_dir: str, output_dir: str, assignment_filter: str = None):
@@ -111,49 +155,36 @@ def aggregate_grades(artifacts_dir: str, output_dir: str, assignment_filter: str
     # Group grades by assignment
     grades_by_assignment = defaultdict(list)
 
-    # Process each artifact directory
-    for artifact_dir in artifacts_path.iterdir():
-        if not artifact_dir.is_dir():
-            continue
-
-        # Parse artifact name to get student_id and assignment_id
-        student_id, assignment_id = parse_artifact_name(artifact_dir.name)
-
-        if not student_id or not assignment_id:
-            print(f"⚠️  Skipping {artifact_dir.name}: couldn't parse artifact name")
-            continue
-
-        # Filter by assignment if specified
-        if assignment_filter and assignment_id != assignment_filter:
-            continue
-
-        # Find the grade_report.json file
-        report_file = artifact_dir / 'grade_report.json'
-        if not report_file.exists():
-            print(f"⚠️  Skipping {artifact_dir.name}: no grade_report.json found")
-            continue
-
-        # Read the report
-        try:
-            with open(report_file) as f:
-                report = json.load(f)
-        except Exception as e:
-            print(f"❌ Error reading {report_file}: {e}")
-            continue
-
-        # Extract grade
-        grade_value, max_points = extract_grade_from_report(report)
-        student_email = get_student_email_from_id(student_id)
-
-        # Add to assignment group
-        grades_by_assignment[assignment_id].append({
-            'email': student_email,
-            'grade': grade_value,
-            'max_points': max_points,
-            'student_id': student_id
-        })
-
-        print(f"✓ Processed {student_email} for {assignment_id}: {grade_value}/{max_points}")
+    # Process artifact directories concurrently to overlap filesystem latency
+    # (scandir reports entry types from the listing, without a stat per entry)
+    with os.scandir(artifacts_path) as it:
+        artifact_dirs = [Path(entry.path) for entry in it if entry.is_dir()]
+    max_workers = max(1, min(MAX_SCAN_WORKERS, len(artifact_dirs)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            lambda d: process_artifact(d, assignment_filter),
+            artifact_dirs
+        )
+
+        # Merge results on the main thread
+        processed = 0
+        for result in results:
+            if result is None:
+                continue
+
+            assignment_id, grade_entry, message = result
+            if grade_entry is None:
+                # Keep every warning/error visible
+                print(message)
+                continue
+
+            grades_by_assignment[assignment_id].append(grade_entry)
+            processed += 1
+            if processed % PROGRESS_EVERY == 0:
+                print(f"✓ Processed {processed} reports...")
+
+    print(f"✓ Processed {processed} reports")
 
     # Write CSV files
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -163,23 +194,22 @@ def aggregate_grades(artifacts_dir: str, output_dir: str, assignment_filter: str
         csv_file = output_path / f'grades_{assignment_id}.csv'
 
         # Sort by email for consistency
-        grades.sort(key=lambda x: x['email'])
+        grades.sort(key=itemgetter('email'))
+
+        # Columns shared by every row of this assignment
+        suffix = (timestamp, assignment_id)
 
-        with open(csv_file, 'w', newline='') as f:
+        # Large buffer so the whole file goes out in a few write() calls
+        with open(csv_file, 'w', newline='', buffering=CSV_BUFFER_SIZE) as f:
             writer = csv.writer(f)
 
             # Write header
             writer.writerow(['Student Email', 'Grade', 'Max Points', 'Timestamp', 'Assignment'])
 
             # Write grades
-            for grade_entry in grades:
-                writer.writerow([
-                    grade_entry['email'],
-                    grade_entry['grade'],
-                    grade_entry['max_points'],
-                    timestamp,
-                    assignment_id
-                ])
+            writer.writerows(
+                (g['email'], g['grade'], g['max_points'], *suffix) for g in grades
+            )
 
         print(f"\n📝 Created {csv_file} with {len(grades)} students")
         total_students += len(grades)
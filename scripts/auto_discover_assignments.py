@@ -7,11 +7,13 @@ import json
 from pathlib import Path
 from typing import List, Dict
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
 
 from src.classroom_client import ClassroomClient
 
+# Maximum number of concurrent coursework requests
+MAX_FETCH_WORKERS = 16
+
 
 def discover_all_assignments(
     include_archived: bool = False,
@@ -63,8 +65,13 @@ def discover_all_assignments(
     # Get assignments from each course
     print("\nStep 2: Fetching assignments from each course...")
 
+    # Courses are independent, so fetch all coursework lists concurrently
+    coursework_lists = client.list_course_work_for_courses(
+        [c['id'] for c in active_courses], MAX_FETCH_WORKERS
+    )
+
     total_assignments = 0
-    for course in active_courses:
+    for course, (coursework, error) in zip(active_courses, coursework_lists):
         course_id = course['id']
         course_name = course.get('name', 'Unnamed Course')
         section = course.get('section', '')
@@ -74,7 +81,8 @@ def discover_all_assignments(
             print(f"  Section: {section}")
 
         try:
-            coursework = client.list_course_work(course_id)
+            if error is not None:
+                raise error
 
             if not coursework:
                 print(f"    No assignments found")
@@ -8,20 +8,38 @@ to Google Classroom via the API. You authenticate once, and it handles all stude
 
 import argparse
 import csv
+import functools
+import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import os
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
 
-from src.classroom_client import ClassroomClient
+# Maximum number of concurrent grade submissions
+MAX_SUBMIT_WORKERS = 8
 
+# Parsed courses_config.json, loaded lazily by _load_courses_config()
+_COURSES_CONFIG = None
 
+
+def _load_courses_config() -> dict:
+    """Load courses_config.json once per process (empty dict if missing)."""
+    global _COURSES_CONFIG
+    if _COURSES_CONFIG is None:
+        config_path = Path('courses_config.json')
+        _COURSES_CONFIG = json.loads(config_path.read_bytes()) if config_path.exists() else {}
+    return _COURSES_CONFIG
+
+
+@functools.lru_cache(maxsize=None)
 def load_assignment_config(assignment_id: str) -> dict:
     """
     Load assignment configuration to get course_id and coursework_id.
 
+    Results are cached per assignment; treat the returned dict as read-only.
+
     Args:
         assignment_id: Assignment identifier
 
@@ -29,24 +47,20 @@ def load_assignment_config(assignment_id: str) -> dict:
         Dictionary with course_id, coursework_id, max_points
     """
     # Try environment variables first
-    coursework_id_env = f"ASSIGNMENT_{assignment_id.upper().replace('-', '_')}_COURSEWORK_ID"
-    course_id_env = f"ASSIGNMENT_{assignment_id.upper().replace('-', '_')}_COURSE_ID"
-    max_points_env = f"ASSIGNMENT_{assignment_id.upper().replace('-', '_')}_MAX_POINTS"
+    env_prefix = f"ASSIGNMENT_{assignment_id.upper().replace('-', '_')}"
+    course_id = os.getenv(f"{env_prefix}_COURSE_ID")
+    coursework_id = os.getenv(f"{env_prefix}_COURSEWORK_ID")
 
-    if os.getenv(coursework_id_env) and os.getenv(course_id_env):
+    if coursework_id and course_id:
         return {
-            'course_id': os.getenv(course_id_env),
-            'coursework_id': os.getenv(coursework_id_env),
-            'max_points': float(os.getenv(max_points_env, '100'))
+            'course_id': course_id,
+            'coursework_id': coursework_id,
+            'max_points': float(os.getenv(f"{env_prefix}_MAX_POINTS", '100'))
         }
 
     # Try courses_config.json
-    import json
-    config_path = Path('courses_config.json')
-    if config_path.exists():
-        with open(config_path) as f:
-            config = json.load(f)
-
+    config = _load_courses_config()
+    if config:
         for course in config.get('courses', []):
             for assignment in course.get('assignments', []):
                 if assignment.get('name') == assignment_id or assignment.get('id') == assignment_id:
@@ -109,24 +123,35 @@ def bulk_submit_grades(csv_file: str, dry_run: bool = False):
     print(f"💯 Max Points: {max_points}")
 
     # Read CSV file
-    grades = []
+    # Plain csv.reader with column indices avoids building a dict per row
     with open(csv_path, newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            grades.append({
-                'email': row['Student Email'],
-                'grade': float(row['Grade']),
-                'max_points': float(row.get('Max Points', max_points))
-            })
+        reader = csv.reader(f)
+        header = next(reader, [])
+        email_idx = header.index('Student Email')
+        grade_idx = header.index('Grade')
+        points_idx = header.index('Max Points') if 'Max Points' in header else None
+
+        # Each entry is (email, grade, max_points)
+        grades = [
+            (
+                row[email_idx],
+                float(row[grade_idx]),
+                float(row[points_idx]) if points_idx is not None and row[points_idx] else float(max_points)
+            )
+            for row in reader
+        ]
 
     print(f"\n📊 Found {len(grades)} students in CSV")
 
     if dry_run:
         print("\n🧪 DRY RUN MODE - No grades will be submitted")
-        for i, grade_entry in enumerate(grades, 1):
-            print(f"   {i}. {grade_entry['email']}: {grade_entry['grade']}/{grade_entry['max_points']}")
+        for i, (email, grade, points) in enumerate(grades, 1):
+            print(f"   {i}. {email}: {grade}/{points}")
         return True
 
+    # Imported here so --dry-run does not load the Google API client
+    from src.classroom_client import ClassroomClient
+
     # Initialize Google Classroom client
     print("\n🔐 Authenticating with Google Classroom...")
     try:
@@ -140,31 +165,29 @@ def bulk_submit_grades(csv_file: str, dry_run: bool = False):
         print("3. Set up token.json with required scopes")
         return False
 
+    # Look up all submissions once instead of once per student
+    print("\n🔎 Fetching submissions...")
+    try:
+        submission_index = client.index_submissions(course_id, coursework_id)
+        print(f"✓ Found {len(submission_index)} submissions")
+    except Exception as e:
+        print(f"❌ Failed to fetch submissions: {e}")
+        return False
+
     # Submit grades
     print(f"\n📤 Submitting grades to Google Classroom...")
     print("=" * 60)
 
-    success_count = 0
-    failed_count = 0
-    skipped_count = 0
-
-    for i, grade_entry in enumerate(grades, 1):
-        email = grade_entry['email']
-        grade = grade_entry['grade']
-        points = grade_entry['max_points']
-
-        print(f"\n[{i}/{len(grades)}] {email}: {grade}/{points}")
+    def submit_one(entry):
+        """Submit one grade; returns (status, message)."""
+        email, grade, points = entry
 
         try:
             # Find student's submission
-            submission_id = client.find_submission_for_student(
-                course_id, coursework_id, email
-            )
+            submission_id = submission_index.get(email.lower())
 
             if not submission_id:
-                print(f"   ⚠️  No submission found - skipping")
-                skipped_count += 1
-                continue
+                return ('skipped', "   ⚠️  No submission found - skipping")
 
             # Submit grade as draft
             success = client.submit_grade(
@@ -176,15 +199,25 @@ def bulk_submit_grades(csv_file: str, dry_run: bool = False):
             )
 
             if success:
-                print(f"   ✓ Grade submitted successfully")
-                success_count += 1
-            else:
-                print(f"   ✗ Submission failed")
-                failed_count += 1
+                return ('success', "   ✓ Grade submitted successfully")
+            return ('failed', "   ✗ Submission failed")
 
         except Exception as e:
-            print(f"   ✗ Error: {e}")
-            failed_count += 1
+            return ('failed', f"   ✗ Error: {e}")
+
+    # Submissions are independent network calls, so overlap them
+    with ThreadPoolExecutor(max_workers=MAX_SUBMIT_WORKERS) as executor:
+        results = list(executor.map(submit_one, grades))
+
+    # Report in CSV order and tally on the main thread
+    for i, ((email, grade, points), (status, message)) in enumerate(zip(grades, results), 1):
+        print(f"\n[{i}/{len(grades)}] {email}: {grade}/{points}")
+        print(message)
+
+    statuses = [status for status, _ in results]
+    success_count = statuses.count('success')
+    failed_count = statuses.count('failed')
+    skipped_count = statuses.count('skipped')
 
     # Summary
     print("\n" + "=" * 60)
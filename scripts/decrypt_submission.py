@@ -3,43 +3,113 @@
 Script to decrypt student submission files in CI/CD pipeline.
 """
 import argparse
+import base64
+import binascii
+import functools
 import json
+import logging
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional, Tuple
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
-from src.encryption import EncryptionManager
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
+from _log_level import log_level
 
+logging.basicConfig(
+    level=log_level(),
+    format='%(message)s'
+)
+logger = logging.getLogger('decrypt')
 
+
+@functools.lru_cache(maxsize=1)
 def load_encryption_keys():
     """
     Load encryption keys from environment variable.
     Returns None if using default key instead of per-student keys.
-    """
-    import base64
 
+    Keys are returned still base64-encoded; only the key that is actually
+    needed is decoded (see decrypt_submissions). The result is cached, so
+    call load_encryption_keys.cache_clear() after changing ENCRYPTION_KEYS.
+    """
     keys_json = os.getenv('ENCRYPTION_KEYS')
     if not keys_json:
         print("ENCRYPTION_KEYS not set, will use default key")
         return None
 
     try:
-        keys_data = json.loads(keys_json)
-
-        # Decode base64-encoded keys
-        decoded_keys = {}
-        for student_id, key_b64 in keys_data.items():
-            decoded_keys[student_id] = base64.b64decode(key_b64).decode('utf-8')
-
-        return decoded_keys
-    except (json.JSONDecodeError, ValueError) as e:
+        return _loads(keys_json)
+    except json.JSONDecodeError as e:
         print(f"Failed to parse ENCRYPTION_KEYS: {e}", file=sys.stderr)
         return None
 
 
+def _is_key_material(value: str) -> bool:
+    """
+    Check whether an ENCRYPTION_KEYS value is already key file content.
+
+    Key files hold a 32-byte key in urlsafe base64, 44 characters long.
+    export_secrets wraps each key file in standard base64, giving 60
+    characters for such a file. A 44-character value that decodes to 32
+    bytes was therefore pasted as-is and must not be decoded a second time.
+    The one exception is a wrapped 24-byte key file: it is also 44
+    characters, but its 32 decoded bytes are base64 text themselves.
+    """
+    if len(value) != 44:
+        return False
+
+    try:
+        decoded = base64.b64decode(value, altchars=b'-_', validate=True)
+    except (binascii.Error, ValueError):
+        return False
+    if len(decoded) != 32:
+        return False
+
+    try:
+        return len(base64.b64decode(decoded, altchars=b'-_', validate=True)) not in (16, 24, 32)
+    except (binascii.Error, ValueError):
+        return True
+
+
+@functools.lru_cache(maxsize=None)
+def _get_worker_manager(student_id: str, key: bytes):
+    """Get the EncryptionManager of the current worker process."""
+    from src.encryption import EncryptionManager
+    # key is already decoded; from_keys would decode it a second time
+    return EncryptionManager.from_raw_keys({student_id: key})
+
+
+def _decrypt_one(task) -> Optional[Tuple[str, str]]:
+    """
+    Decrypt a single file; runs in a worker process.
+
+    Args:
+        task: Tuple of (encrypted_path, decrypted_path, student_id, key)
+
+    Returns:
+        None on success, otherwise (error description, formatted traceback)
+    """
+    encrypted_path, decrypted_path, student_id, key = task
+
+    try:
+        manager = _get_worker_manager(student_id, key)
+        if not manager.decrypt_file(encrypted_path, decrypted_path, student_id):
+            raise RuntimeError("Manager reported decryption failure")
+    except Exception as e:
+        import traceback
+        return f"{type(e).__name__}: {e}", traceback.format_exc()
+
+    return None
+
+
 def decrypt_submissions(student_id: str, assignment_id: str):
     """
     Decrypt submission files for a student.
@@ -48,12 +118,14 @@ def decrypt_submissions(student_id: str, assignment_id: str):
         student_id: Student identifier (email-based)
         assignment_id: Assignment identifier (name-based)
     """
+    # Imported here so --help does not load the cryptography package
+    from src.encryption import EncryptionManager
+
     # Load keys
     keys_data = load_encryption_keys()
 
     # Set up encryption manager
     keys_dir = Path("student_keys")
-    keys_dir.mkdir(exist_ok=True)
 
     if keys_data is None:
         # Use default encryption key
@@ -62,7 +134,6 @@ def decrypt_submissions(student_id: str, assignment_id: str):
         # Check if default key secret is provided
         default_key_b64 = os.getenv('DEFAULT_ENCRYPTION_KEY')
         if default_key_b64:
-            import base64
             # Strip any whitespace that might have been added
             default_key_b64 = default_key_b64.strip()
 
@@ -70,8 +141,14 @@ def decrypt_submissions(student_id: str, assignment_id: str):
             default_key = base64.b64decode(default_key_b64)
 
 
+            # Owner-only key file, written without the pathlib/text layers
+            keys_dir.mkdir(mode=0o700, exist_ok=True)
             default_key_path = keys_dir / "default.key"
-            default_key_path.write_bytes(default_key)
+            fd = os.open(default_key_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+            try:
+                os.write(fd, default_key)
+            finally:
+                os.close(fd)
             print("Loaded default key from environment")
 
         encryption_manager = EncryptionManager(keys_dir, use_default_key=True)
@@ -80,48 +157,75 @@ def decrypt_submissions(student_id: str, assignment_id: str):
         if student_id not in keys_data:
             raise ValueError(f"No encryption key found for student {student_id}")
 
-        # Write student's key to file
-        key_path = keys_dir / f"{student_id}.key"
-        key_path.write_text(keys_data[student_id])
+        # Decode only this student's key
+        student_key = keys_data[student_id]
+        if not _is_key_material(student_key):
+            try:
+                student_key = binascii.a2b_base64(student_key).decode('utf-8')
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Invalid encryption key for student {student_id}: {e}")
 
-        encryption_manager = EncryptionManager(keys_dir, use_default_key=False)
+        # Keep the key in memory; nothing needs to read it back from disk
+        encryption_manager = EncryptionManager.from_keys({student_id: student_key}, keys_dir)
 
     # Find encrypted files (assignment_id is now the assignment name)
     submissions_dir = Path("submissions") / student_id / assignment_id
     decrypted_dir = Path("decrypted_submissions") / student_id / assignment_id
     decrypted_dir.mkdir(parents=True, exist_ok=True)
 
-    if not submissions_dir.exists():
+    # Single scandir pass; DirEntry caches file type from the directory listing
+    try:
+        with os.scandir(submissions_dir) as it:
+            encrypted_files = sorted(
+                (entry for entry in it
+                 if entry.name.endswith('.enc') and entry.is_file(follow_symlinks=False)),
+                key=lambda entry: entry.name
+            )
+    except FileNotFoundError:
         print(f"No submissions found at {submissions_dir}")
         return
+    logger.info("Found %d encrypted files", len(encrypted_files))
 
-    encrypted_files = list(submissions_dir.glob("*.enc"))
-    print(f"Found {len(encrypted_files)} encrypted files")
+    # Resolve the key once; workers receive the raw key bytes
+    key = encryption_manager.get_or_create_key(student_id)
+
+    tasks = []
+    for entry in encrypted_files:
+        # Display debug information (stat only when it will be shown)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s: encrypted file size: %d bytes, key length: %d bytes",
+                         entry.name, entry.stat().st_size, len(key))
 
-    for encrypted_file in encrypted_files:
         # Remove .enc extension for decrypted file
-        decrypted_name = encrypted_file.name[:-4]
-        decrypted_path = decrypted_dir / decrypted_name
-
-        try:
-            # Display debug information
-            key = encryption_manager.get_or_create_key(student_id)
-            encrypted_data = encrypted_file.read_bytes()
-            print(f"Encrypted file size: {len(encrypted_data)} bytes")
-            print(f"Key length: {len(key)} bytes")
-
-            if not encryption_manager.decrypt_file(encrypted_file, decrypted_path, student_id):
-                raise RuntimeError("Manager reported decryption failure")
-
-            print(f"✓ Decrypted: {decrypted_name}")
-        except Exception as e:
-            print(f"✗ Failed to decrypt: {encrypted_file.name}")
-            print(f"Error details: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
-            sys.exit(1)
-
-    print(f"\nAll files decrypted to: {decrypted_dir}")
+        decrypted_path = decrypted_dir / entry.name[:-4]
+        tasks.append((Path(entry.path), decrypted_path, student_id, key))
+
+    # Files are independent and decryption is CPU-bound, so use all cores
+    if len(tasks) > 1:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_decrypt_one, tasks, chunksize=4))
+    else:
+        results = [_decrypt_one(task) for task in tasks]
+
+    # Report every failure before exiting
+    failed = 0
+    for (encrypted_file, decrypted_path, *_), error in zip(tasks, results):
+        if error is None:
+            logger.debug("✓ Decrypted: %s", decrypted_path.name)
+            continue
+
+        failed += 1
+        print(f"✗ Failed to decrypt: {encrypted_file.name}")
+        details, formatted_traceback = error
+        print(f"Error details: {details}")
+        print(formatted_traceback, end='', file=sys.stderr)
+
+    if failed:
+        print(f"{failed} of {len(tasks)} files failed to decrypt")
+        sys.exit(1)
+
+    logger.info("Decrypted %d files to: %s", len(encrypted_files), decrypted_dir)
 
 
 def main():
@@ -6,22 +6,77 @@ Designed to run in GitHub Actions.
 import os
 import sys
 import json
+import functools
 import logging
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, NamedTuple, Optional
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
+from _log_level import log_level
+
+if TYPE_CHECKING:
+    from src.submission_processor import SubmissionProcessor
 
-from src.submission_processor import SubmissionProcessor
 
 logging.basicConfig(
-    level=logging.INFO,
+    level=log_level(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+# Concurrent coursework requests (kept low for the Classroom API quota)
+MAX_FETCH_WORKERS = 8
+
+SUMMARY_HEADER_TEMPLATE = """
+### Download Summary
+- Total assignments: {total}
+- Successful: {successful}
+- Failed: {failed}
+
+### Details:
+"""
+
+
+@dataclass(slots=True)
+class AssignmentResult:
+    """Outcome of processing one assignment."""
+    name: str
+    status: str
+    course_id: str
+    coursework_id: str
+    error: Optional[str] = None
+
+
+class EnvConfig(NamedTuple):
+    """Download settings read from the environment."""
+    course_id: str
+    coursework_id: str
+    course_ids: List[str]
+    courses_config_json: Optional[str]
+    assignments_config_json: Optional[str]
+
+
+@functools.cache
+def _env_config() -> EnvConfig:
+    """Read and normalize all environment settings once per process."""
+    course_ids_str = os.getenv('COURSE_IDS') or ''
+    return EnvConfig(
+        course_id=os.getenv('COURSE_ID', '').strip(),
+        coursework_id=os.getenv('COURSEWORK_ID', '').strip(),
+        course_ids=list(filter(None, map(str.strip, course_ids_str.split(',')))),
+        courses_config_json=os.getenv('COURSES_CONFIG'),
+        assignments_config_json=os.getenv('ASSIGNMENTS_CONFIG'),
+    )
 
+
+@functools.lru_cache(maxsize=1)
 def load_courses_config() -> Optional[List[Dict]]:
     """
     Load courses configuration from environment or file.
@@ -30,22 +85,24 @@ def load_courses_config() -> Optional[List[Dict]]:
     2. COURSES_CONFIG env var: JSON array
     3. courses_config.json file: JSON array
 
+    The environment is read once per process; to reload, call cache_clear()
+    on this function and on _env_config().
+
     Returns:
         List of course configurations or None
     """
+    env = _env_config()
+
     # Try simple COURSE_IDS first (easiest)
-    course_ids_str = os.getenv('COURSE_IDS')
-    if course_ids_str:
-        course_ids = [cid.strip() for cid in course_ids_str.split(',') if cid.strip()]
-        if course_ids:
-            logger.info(f"Using COURSE_IDS from environment: {len(course_ids)} course(s)")
-            return [{"course_id": cid} for cid in course_ids]
+    if env.course_ids:
+        logger.info(f"Using COURSE_IDS from environment: {len(env.course_ids)} course(s)")
+        return [{"course_id": cid} for cid in env.course_ids]
 
     # Try COURSES_CONFIG JSON
-    config_json = os.getenv('COURSES_CONFIG')
+    config_json = env.courses_config_json
     if config_json:
         try:
-            return json.loads(config_json)
+            return _loads(config_json)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse COURSES_CONFIG: {e}")
             return None
@@ -54,8 +111,7 @@ def load_courses_config() -> Optional[List[Dict]]:
     config_path = Path('courses_config.json')
     if config_path.exists():
         try:
-            with open(config_path) as f:
-                return json.load(f)
+            return _loads(config_path.read_bytes())
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse courses_config.json: {e}")
             return None
@@ -63,6 +119,7 @@ def load_courses_config() -> Optional[List[Dict]]:
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def load_assignments_config() -> Optional[List[Dict]]:
     """
     Load assignments configuration from environment or file.
@@ -72,10 +129,10 @@ def load_assignments_config() -> Optional[List[Dict]]:
         List of assignment configurations or None
     """
     # Try to load from environment variable
-    config_json = os.getenv('ASSIGNMENTS_CONFIG')
+    config_json = _env_config().assignments_config_json
     if config_json:
         try:
-            return json.loads(config_json)
+            return _loads(config_json)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse ASSIGNMENTS_CONFIG: {e}")
             return None
@@ -84,8 +141,7 @@ def load_assignments_config() -> Optional[List[Dict]]:
     config_path = Path('assignments_config.json')
     if config_path.exists():
         try:
-            with open(config_path) as f:
-                return json.load(f)
+            return _loads(config_path.read_bytes())
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse assignments_config.json: {e}")
             return None
@@ -93,7 +149,7 @@ def load_assignments_config() -> Optional[List[Dict]]:
     return None
 
 
-def process_assignments(processor: SubmissionProcessor, assignments: List[Dict]) -> Dict:
+def process_assignments(processor: 'SubmissionProcessor', assignments: List[Dict]) -> Dict:
     """
     Process a list of assignments.
 
@@ -102,7 +158,7 @@ def process_assignments(processor: SubmissionProcessor, assignments: List[Dict])
         assignments: List of assignment configurations
 
     Returns:
-        Summary statistics
+        Summary statistics; details is a list of AssignmentResult
     """
     summary = {
         'total_assignments': len(assignments),
@@ -127,29 +183,22 @@ def process_assignments(processor: SubmissionProcessor, assignments: List[Dict])
             # Pass the assignment name to use instead of ID
             processor.process_course_submissions(course_id, coursework_id, name)
             summary['successful'] += 1
-            summary['details'].append({
-                'name': name,
-                'status': 'success',
-                'course_id': course_id,
-                'coursework_id': coursework_id
-            })
+            summary['details'].append(
+                AssignmentResult(name, 'success', course_id, coursework_id)
+            )
             logger.info(f"✓ Successfully processed: {name}")
 
         except Exception as e:
             logger.error(f"✗ Failed to process {name}: {e}")
             summary['failed'] += 1
-            summary['details'].append({
-                'name': name,
-                'status': 'failed',
-                'error': str(e),
-                'course_id': course_id,
-                'coursework_id': coursework_id
-            })
+            summary['details'].append(
+                AssignmentResult(name, 'failed', course_id, coursework_id, str(e))
+            )
 
     return summary
 
 
-def process_single_assignment(processor: SubmissionProcessor, course_id: str, coursework_id: str):
+def process_single_assignment(processor: 'SubmissionProcessor', course_id: str, coursework_id: str):
     """
     Process a single assignment.
 
@@ -167,24 +216,28 @@ def process_single_assignment(processor: SubmissionProcessor, course_id: str, co
 
         # Write summary
         with open('download_summary.txt', 'w') as f:
-            f.write(f"\n### Assignment Processed\n")
-            f.write(f"- Course ID: {course_id}\n")
-            f.write(f"- Coursework ID: {coursework_id}\n")
-            f.write(f"- Status: Success\n")
+            f.write(
+                "\n### Assignment Processed\n"
+                f"- Course ID: {course_id}\n"
+                f"- Coursework ID: {coursework_id}\n"
+                "- Status: Success\n"
+            )
 
     except Exception as e:
         logger.error(f"✗ Failed to process assignment: {e}")
 
         with open('download_summary.txt', 'w') as f:
-            f.write(f"\n### Assignment Failed\n")
-            f.write(f"- Course ID: {course_id}\n")
-            f.write(f"- Coursework ID: {coursework_id}\n")
-            f.write(f"- Error: {str(e)}\n")
+            f.write(
+                "\n### Assignment Failed\n"
+                f"- Course ID: {course_id}\n"
+                f"- Coursework ID: {coursework_id}\n"
+                f"- Error: {str(e)}\n"
+            )
 
         raise
 
 
-def auto_discover_from_courses(processor: SubmissionProcessor, courses: List[Dict]) -> List[Dict]:
+def auto_discover_from_courses(processor: 'SubmissionProcessor', courses: List[Dict]) -> List[Dict]:
     """
     Auto-discover all assignments from specified courses.
 
@@ -199,18 +252,27 @@ def auto_discover_from_courses(processor: SubmissionProcessor, courses: List[Dic
 
     logger.info(f"Auto-discovering assignments from {len(courses)} course(s)")
 
+    valid_courses = []
     for course_config in courses:
-        course_id = course_config.get('course_id')
-        course_name = course_config.get('name', f'Course {course_id}')
-
-        if not course_id:
+        if not course_config.get('course_id'):
             logger.warning(f"Skipping course config without course_id: {course_config}")
             continue
+        valid_courses.append(course_config)
+
+    # Each course is a separate round-trip; fetch them concurrently
+    results = processor.classroom.list_course_work_for_courses(
+        [c['course_id'] for c in valid_courses], MAX_FETCH_WORKERS
+    )
+
+    for course_config, (coursework_list, error) in zip(valid_courses, results):
+        course_id = course_config['course_id']
+        course_name = course_config.get('name', f'Course {course_id}')
 
         logger.info(f"Fetching assignments from: {course_name}")
 
         try:
-            coursework_list = processor.classroom.list_course_work(course_id)
+            if error is not None:
+                raise error
 
             # Filter to only published assignments
             published = [w for w in coursework_list if w.get('state') == 'PUBLISHED']
@@ -228,7 +290,7 @@ def auto_discover_from_courses(processor: SubmissionProcessor, courses: List[Dic
                 }
 
                 discovered.append(assignment)
-                logger.info(f"    ✓ {work_title}")
+                logger.debug("    ✓ %s", work_title)
 
         except Exception as e:
             logger.error(f"Failed to fetch coursework from {course_name}: {e}")
@@ -238,7 +300,7 @@ def auto_discover_from_courses(processor: SubmissionProcessor, courses: List[Dic
     return discovered
 
 
-def process_all_configured(processor: SubmissionProcessor):
+def process_all_configured(processor: 'SubmissionProcessor'):
     """
     Process all configured assignments.
     Supports two modes:
@@ -258,9 +320,11 @@ def process_all_configured(processor: SubmissionProcessor):
         if not assignments:
             logger.warning("No assignments discovered from configured courses")
             with open('download_summary.txt', 'w') as f:
-                f.write(f"\n### No Assignments Found\n")
-                f.write(f"- Checked {len(courses)} configured course(s)\n")
-                f.write(f"- No published assignments found\n")
+                f.write(
+                    "\n### No Assignments Found\n"
+                    f"- Checked {len(courses)} configured course(s)\n"
+                    "- No published assignments found\n"
+                )
             return
 
     else:
@@ -277,14 +341,18 @@ def process_all_configured(processor: SubmissionProcessor):
                 all_courses = processor.classroom.list_courses()
                 logger.info(f"Found {len(all_courses)} courses")
 
+                parts = [
+                    "\n### No Configuration Found\n",
+                    f"- Found {len(all_courses)} available courses\n",
+                    "- Create courses_config.json with course IDs (recommended)\n",
+                    "- Or create assignments_config.json with specific assignments\n",
+                    "\n### Available Courses:\n",
+                ]
+                for course in all_courses[:10]:  # Show first 10
+                    parts.append(f"- {course['name']} (ID: {course['id']})\n")
+
                 with open('download_summary.txt', 'w') as f:
-                    f.write(f"\n### No Configuration Found\n")
-                    f.write(f"- Found {len(all_courses)} available courses\n")
-                    f.write(f"- Create courses_config.json with course IDs (recommended)\n")
-                    f.write(f"- Or create assignments_config.json with specific assignments\n")
-                    f.write(f"\n### Available Courses:\n")
-                    for course in all_courses[:10]:  # Show first 10
-                        f.write(f"- {course['name']} (ID: {course['id']})\n")
+                    f.write(''.join(parts))
 
             except Exception as e:
                 logger.error(f"Failed to list courses: {e}")
@@ -298,18 +366,19 @@ def process_all_configured(processor: SubmissionProcessor):
     summary = process_assignments(processor, assignments)
 
     # Write summary
+    header = SUMMARY_HEADER_TEMPLATE.format(
+        total=summary['total_assignments'],
+        successful=summary['successful'],
+        failed=summary['failed'],
+    )
+    lines = [
+        f"{'✓' if d.status == 'success' else '✗'} {d.name}: {d.status}\n"
+        + (f"  Error: {d.error}\n" if d.error is not None else '')
+        for d in summary['details']
+    ]
+
     with open('download_summary.txt', 'w') as f:
-        f.write(f"\n### Download Summary\n")
-        f.write(f"- Total assignments: {summary['total_assignments']}\n")
-        f.write(f"- Successful: {summary['successful']}\n")
-        f.write(f"- Failed: {summary['failed']}\n")
-        f.write(f"\n### Details:\n")
-
-        for detail in summary['details']:
-            status_icon = "✓" if detail['status'] == 'success' else "✗"
-            f.write(f"{status_icon} {detail['name']}: {detail['status']}\n")
-            if 'error' in detail:
-                f.write(f"  Error: {detail['error']}\n")
+        f.write(header + ''.join(lines))
 
     logger.info("Summary written to download_summary.txt")
 
@@ -326,14 +395,18 @@ def process_all_configured(processor: SubmissionProcessor):
 def main():
     """Main entry point."""
     # Get inputs from environment (set by GitHub Actions)
-    course_id = os.getenv('COURSE_ID', '').strip()
-    coursework_id = os.getenv('COURSEWORK_ID', '').strip()
+    env = _env_config()
+    course_id = env.course_id
+    coursework_id = env.coursework_id
 
     logger.info("Starting submission download script")
     logger.info(f"Course ID from env: {course_id if course_id else 'Not set'}")
     logger.info(f"Coursework ID from env: {coursework_id if coursework_id else 'Not set'}")
 
     try:
+        # Imported here so the Classroom API client only loads when needed
+        from src.submission_processor import SubmissionProcessor
+
         # Initialize processor
         processor = SubmissionProcessor()
 
@@ -348,9 +421,7 @@ def main():
         logger.info("Download script completed successfully")
 
     except Exception as e:
-        logger.error(f"Download script failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Download script failed: {e}")
         sys.exit(1)
 
 
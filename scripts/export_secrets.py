@@ -3,16 +3,53 @@
 Helper script to export secrets for GitHub Actions.
 Converts files to formats suitable for GitHub Secrets.
 """
+import argparse
 import os
-import base64
 import json
+import mmap
+import re
+import shutil
 import sys
 from pathlib import Path
+from typing import Dict, List, Tuple
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+try:
+    import orjson
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode('ascii')
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(',', ':'))
 
-from src.encryption import EncryptionManager
+try:
+    # SIMD-accelerated, drop-in compatible encoder
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+# Read size for files that cannot be memory-mapped (3 MiB, a multiple of 3)
+B64_CHUNK_SIZE = 3 << 20
+
+# First "COURSE_IDS=..." line of a .env file
+_COURSE_IDS_RE = re.compile(rb'^[ \t\r\f\v]*COURSE_IDS=(.*)$', re.MULTILINE)
+
+# Where EncryptionManager keeps key files by default; only the directory is
+# needed here, so the manager (and the cryptography package) is not loaded
+KEYS_DIR = Path("student_keys")
+
+# Key file path -> (st_mtime_ns, base64 of its contents)
+_KEY_CACHE: Dict[str, Tuple[int, str]] = {}
+
+# Banner lines
+SEP = "=" * 80
+SECTION_RULE = "-" * 80
+SUB = "─" * 80
+
+
+def _write_lines(lines: List[str]):
+    """Write the collected lines to stdout in one call and clear them."""
+    sys.stdout.write('\n'.join(lines) + '\n')
+    lines.clear()
 
 
 def export_file_as_base64(file_path: Path) -> str:
@@ -29,13 +66,19 @@ def export_file_as_base64(file_path: Path) -> str:
         raise FileNotFoundError(f"File not found: {file_path}")
 
     with open(file_path, 'rb') as f:
-        content = f.read()
-
-    # Encode to base64 as a single line (no line breaks)
-    b64_string = base64.b64encode(content).decode('utf-8')
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty or unmappable (e.g. a pipe): encode in bounded chunks.
+            # The chunk size is a multiple of 3, so only the last chunk pads.
+            return ''.join(
+                b64encode(chunk).decode('ascii')
+                for chunk in iter(lambda: f.read(B64_CHUNK_SIZE), b'')
+            )
 
-    # Ensure no whitespace
-    return b64_string.strip()
+        # Encode the mapped pages directly (single line, no line breaks)
+        with mm:
+            return b64encode(mm).decode('ascii')
 
 
 def export_json_file(file_path: Path) -> str:
@@ -51,249 +94,329 @@ def export_json_file(file_path: Path) -> str:
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    with open(file_path, 'r') as f:
-        content = f.read()
+    # Decode once; no newline translation needed for a verbatim copy
+    return file_path.read_bytes().decode('utf-8')
 
-    return content
+
+def print_file_contents(file_path: Path):
+    """
+    Copy a file verbatim to stdout without building a Python string.
+
+    Uses sendfile(2) where available and falls back to a buffered copy.
+
+    Args:
+        file_path: Path to the file
+    """
+    # Text written so far must reach the descriptor before the raw bytes
+    sys.stdout.flush()
+    offset = 0
+    with open(file_path, 'rb') as src:
+        size = os.fstat(src.fileno()).st_size
+        try:
+            out_fd = sys.stdout.fileno()
+            while offset < size:
+                sent = os.sendfile(out_fd, src.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (OSError, AttributeError):
+            # No sendfile here, or stdout is not backed by a descriptor
+            src.seek(offset)
+            shutil.copyfileobj(src, sys.stdout.buffer)
+            sys.stdout.buffer.flush()
 
 
-def export_encryption_keys() -> str:
+def export_encryption_keys(compact: bool = True) -> Tuple[str, int]:
     """
     Export all student encryption keys as JSON.
 
+    Args:
+        compact: Emit JSON without whitespace (what the secret should hold);
+            False indents it for reading
+
     Returns:
-        JSON string with all keys
+        Tuple of (JSON string with all keys, number of keys), so callers
+        can test for keys without parsing the JSON back
     """
-    manager = EncryptionManager()
-    keys_dir = manager.keys_dir
-
-    if not keys_dir.exists():
-        return "{}"
+    try:
+        entries = os.scandir(KEYS_DIR)
+    except (FileNotFoundError, PermissionError):
+        return "{}", 0
 
     keys_data = {}
-    for key_file in keys_dir.glob("*.key"):
-        student_id = key_file.stem
-        key = key_file.read_bytes()
-        # Encode key as base64 for JSON serialization
-        keys_data[student_id] = base64.b64encode(key).decode('utf-8')
+    # Single scandir pass; DirEntry caches the file type
+    with entries:
+        for entry in entries:
+            if not (entry.name.endswith('.key') and entry.is_file()):
+                continue
+            # Reuse the encoding of key files unchanged since the last call
+            mtime = entry.stat().st_mtime_ns
+            cached = _KEY_CACHE.get(entry.path)
+            if cached and cached[0] == mtime:
+                key_b64 = cached[1]
+            else:
+                with open(entry.path, 'rb') as f:
+                    key = f.read()
+                # Encode key as base64 for JSON serialization
+                key_b64 = b64encode(key).decode('ascii')
+                _KEY_CACHE[entry.path] = (mtime, key_b64)
+            keys_data[entry.name[:-4]] = key_b64
 
-    return json.dumps(keys_data, indent=2)
+    keys_json = _dumps(keys_data) if compact else json.dumps(keys_data, indent=2)
+    return keys_json, len(keys_data)
 
 
 def main():
     """Main function to export all secrets."""
-    print("=" * 80)
-    print("GITHUB SECRETS EXPORT HELPER")
-    print("=" * 80)
-    print("\nThis script will help you export files for GitHub Secrets.")
-    print("Copy the output values to your GitHub repository secrets.\n")
-    print("=" * 80)
+    parser = argparse.ArgumentParser(description="Export secrets for GitHub Actions")
+    parser.add_argument("--pretty", action="store_true",
+                        help="Indent ENCRYPTION_KEYS JSON on screen (the saved file stays compact)")
+    args = parser.parse_args()
+
+    # Each section is collected here and written with one call
+    out: List[str] = []
+
+    out.append(SEP)
+    out.append("GITHUB SECRETS EXPORT HELPER")
+    out.append(SEP)
+    out.append("\nThis script will help you export files for GitHub Secrets.")
+    out.append("Copy the output values to your GitHub repository secrets.\n")
+    out.append(SEP)
+
+    _write_lines(out)
 
     # 1. GOOGLE_CREDENTIALS
-    print("\n1. GOOGLE_CREDENTIALS")
-    print("-" * 80)
+    out.append("\n1. GOOGLE_CREDENTIALS")
+    out.append(SECTION_RULE)
     credentials_path = Path("credentials.json")
+    credentials = None
     if credentials_path.exists():
         try:
             credentials = export_json_file(credentials_path)
-            print("✓ Found credentials.json")
-            print("\nCopy this to GitHub Secret 'GOOGLE_CREDENTIALS':")
-            print("\n" + "─" * 80)
-            print(credentials)
-            print("─" * 80)
+            out.append("✓ Found credentials.json")
+            out.append("\nCopy this to GitHub Secret 'GOOGLE_CREDENTIALS':")
+            out.append("\n" + SUB)
+            out.append(credentials)
+            out.append(SUB)
         except Exception as e:
-            print(f"✗ Error reading credentials.json: {e}")
+            out.append(f"✗ Error reading credentials.json: {e}")
     else:
-        print("✗ credentials.json not found")
-        print("  Please complete Google Cloud setup first (see README.md)")
+        out.append("✗ credentials.json not found")
+        out.append("  Please complete Google Cloud setup first (see README.md)")
+
+    _write_lines(out)
 
     # 2. GOOGLE_TOKEN (base64 encoded because it's binary)
-    print("\n\n2. GOOGLE_TOKEN (optional, but recommended)")
-    print("-" * 80)
+    out.append("\n\n2. GOOGLE_TOKEN (optional, but recommended)")
+    out.append(SECTION_RULE)
     token_path = Path("token.json")
+    token_b64 = None
     if token_path.exists():
         try:
             token_b64 = export_file_as_base64(token_path)
-            print("✓ Found token.json")
-            print(f"  File size: {token_path.stat().st_size} bytes")
-            print(f"  Base64 length: {len(token_b64)} characters")
-            print("\nCopy this ENTIRE string to GitHub Secret 'GOOGLE_TOKEN':")
-            print("(Copy from the first character to the last, no extra spaces)")
-            print("\n" + "─" * 80)
-            print(token_b64)
-            print("─" * 80)
-            print("\nIMPORTANT:")
-            print("  - Copy the ENTIRE string above (all on one line)")
-            print("  - Do NOT add any spaces or newlines before/after")
-            print("  - The workflow will decode it automatically")
-            print("\nTo verify the base64 is valid:")
-            print(f"  echo '{token_b64[:50]}...' | base64 -d > /dev/null && echo 'Valid' || echo 'Invalid'")
+            out.append("✓ Found token.json")
+            out.append(f"  File size: {token_path.stat().st_size} bytes")
+            out.append(f"  Base64 length: {len(token_b64)} characters")
+            out.append("\nCopy this ENTIRE string to GitHub Secret 'GOOGLE_TOKEN':")
+            out.append("(Copy from the first character to the last, no extra spaces)")
+            out.append("\n" + SUB)
+            out.append(token_b64)
+            out.append(SUB)
+            out.append("\nIMPORTANT:")
+            out.append("  - Copy the ENTIRE string above (all on one line)")
+            out.append("  - Do NOT add any spaces or newlines before/after")
+            out.append("  - The workflow will decode it automatically")
+            out.append("\nTo verify the base64 is valid:")
+            out.append(f"  echo '{token_b64[:50]}...' | base64 -d > /dev/null && echo 'Valid' || echo 'Invalid'")
         except Exception as e:
-            print(f"✗ Error reading token.json: {e}")
+            out.append(f"✗ Error reading token.json: {e}")
     else:
-        print("✗ token.json not found")
-        print("  Authenticate first by running: python example_usage.py")
-        print("  Then run this script again.")
+        out.append("✗ token.json not found")
+        out.append("  Authenticate first by running: python example_usage.py")
+        out.append("  Then run this script again.")
+
+    _write_lines(out)
 
     # 3. ENCRYPTION_KEYS or DEFAULT_ENCRYPTION_KEY
-    print("\n\n3. ENCRYPTION_KEYS (or DEFAULT_ENCRYPTION_KEY)")
-    print("-" * 80)
+    out.append("\n\n3. ENCRYPTION_KEYS (or DEFAULT_ENCRYPTION_KEY)")
+    out.append(SECTION_RULE)
+
+    keys_json = None
+    key_count = 0
 
     # Check if using default key
     use_default = os.getenv('USE_DEFAULT_ENCRYPTION_KEY', 'true').lower() == 'true'
 
     if use_default:
-        print("Using default encryption key mode (USE_DEFAULT_ENCRYPTION_KEY=true)")
-        default_key_path = Path("student_keys/default.key")
+        out.append("Using default encryption key mode (USE_DEFAULT_ENCRYPTION_KEY=true)")
+        default_key_path = KEYS_DIR / "default.key"
 
         if default_key_path.exists():
             default_key = default_key_path.read_bytes()
-            default_key_b64 = base64.b64encode(default_key).decode('utf-8')
-
-            print("✓ Found default encryption key")
-            print("\nCopy this to GitHub Secret 'DEFAULT_ENCRYPTION_KEY':")
-            print("\n" + "─" * 80)
-            print(default_key_b64)
-            print("─" * 80)
-            print("\nNote: This single key will be used for all students (simpler setup)")
+            default_key_b64 = b64encode(default_key).decode('ascii')
+
+            out.append("✓ Found default encryption key")
+            out.append("\nCopy this to GitHub Secret 'DEFAULT_ENCRYPTION_KEY':")
+            out.append("\n" + SUB)
+            out.append(default_key_b64)
+            out.append(SUB)
+            out.append("\nNote: This single key will be used for all students (simpler setup)")
         else:
-            print("✗ No default key found yet")
-            print("  Will be generated on first submission")
+            out.append("✗ No default key found yet")
+            out.append("  Will be generated on first submission")
     else:
-        print("Using per-student keys mode (USE_DEFAULT_ENCRYPTION_KEY=false)")
+        out.append("Using per-student keys mode (USE_DEFAULT_ENCRYPTION_KEY=false)")
         try:
-            keys_json = export_encryption_keys()
-            keys_data = json.loads(keys_json)
-
-            if keys_data:
-                print(f"✓ Found {len(keys_data)} student encryption key(s)")
-                print("\nCopy this to GitHub Secret 'ENCRYPTION_KEYS':")
-                print("\n" + "─" * 80)
-                print(keys_json)
-                print("─" * 80)
-                print("\nNote: Keys are base64-encoded for JSON serialization.")
+            keys_json, key_count = export_encryption_keys()
+
+            if key_count:
+                out.append(f"✓ Found {key_count} student encryption key(s)")
+                out.append("\nCopy this to GitHub Secret 'ENCRYPTION_KEYS':")
+                out.append("\n" + SUB)
+                # Key encodings are cached, so the indented variant is cheap
+                out.append(export_encryption_keys(compact=False)[0] if args.pretty else keys_json)
+                out.append(SUB)
+                out.append("\nNote: Keys are base64-encoded for JSON serialization.")
             else:
-                print("✗ No student keys found")
-                print("  Keys will be generated when you process your first submissions")
+                out.append("✗ No student keys found")
+                out.append("  Keys will be generated when you process your first submissions")
         except Exception as e:
-            print(f"✗ Error exporting encryption keys: {e}")
+            out.append(f"✗ Error exporting encryption keys: {e}")
+
+    _write_lines(out)
 
     # 4. COURSE_IDS (simplest - just course IDs)
-    print("\n\n4. COURSE_IDS (simplest, recommended)")
-    print("-" * 80)
+    out.append("\n\n4. COURSE_IDS (simplest, recommended)")
+    out.append(SECTION_RULE)
 
     # Check .env file
     env_path = Path(".env")
     course_ids = None
 
     if env_path.exists():
-        with open(env_path) as f:
-            for line in f:
-                if line.strip().startswith('COURSE_IDS='):
-                    course_ids = line.split('=', 1)[1].strip()
-                    break
+        with open(env_path, 'rb') as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    match = _COURSE_IDS_RE.search(mm)
+                    if match:
+                        value = mm[match.start(1):match.end(1)]
+                        course_ids = value.strip().decode('utf-8')
+                    del match  # release the view before the map closes
+            except ValueError:  # empty file
+                pass
 
     if course_ids:
-        print("✓ Found COURSE_IDS in .env")
-        print(f"  Value: {course_ids}")
-        print("\nCopy this to GitHub Secret 'COURSE_IDS':")
-        print("\n" + "─" * 80)
-        print(course_ids)
-        print("─" * 80)
-        print("\nNote: This will auto-discover ALL assignments from these courses")
+        out.append("✓ Found COURSE_IDS in .env")
+        out.append(f"  Value: {course_ids}")
+        out.append("\nCopy this to GitHub Secret 'COURSE_IDS':")
+        out.append("\n" + SUB)
+        out.append(course_ids)
+        out.append(SUB)
+        out.append("\nNote: This will auto-discover ALL assignments from these courses")
     else:
-        print("✗ COURSE_IDS not found in .env")
-        print("  Add to .env: COURSE_IDS=123456789,987654321")
-        print("  (Comma-separated list of course IDs)")
-        print("  This is the simplest setup method!")
+        out.append("✗ COURSE_IDS not found in .env")
+        out.append("  Add to .env: COURSE_IDS=123456789,987654321")
+        out.append("  (Comma-separated list of course IDs)")
+        out.append("  This is the simplest setup method!")
+
+    _write_lines(out)
 
     # 5. COURSES_CONFIG (alternative - with course names)
-    print("\n\n5. COURSES_CONFIG (alternative)")
-    print("-" * 80)
+    out.append("\n\n5. COURSES_CONFIG (alternative)")
+    out.append(SECTION_RULE)
     courses_path = Path("courses_config.json")
     if courses_path.exists():
         try:
-            courses = export_json_file(courses_path)
-            print("✓ Found courses_config.json")
-            print("\nCopy this to GitHub Secret 'COURSES_CONFIG':")
-            print("\n" + "─" * 80)
-            print(courses)
-            print("─" * 80)
-            print("\nNote: This will auto-discover ALL assignments from these courses")
+            out.append("✓ Found courses_config.json")
+            out.append("\nCopy this to GitHub Secret 'COURSES_CONFIG':")
+            out.append("\n" + SUB)
+            _write_lines(out)
+            # Only shown, never saved, so stream it instead of reading it in
+            print_file_contents(courses_path)
+            out.append("\n" + SUB)
+            out.append("\nNote: This will auto-discover ALL assignments from these courses")
         except Exception as e:
-            print(f"✗ Error reading courses_config.json: {e}")
+            out.append(f"✗ Error reading courses_config.json: {e}")
     else:
-        print("✗ courses_config.json not found")
-        print("  Not needed if using COURSE_IDS (recommended)")
+        out.append("✗ courses_config.json not found")
+        out.append("  Not needed if using COURSE_IDS (recommended)")
+
+    _write_lines(out)
 
     # 6. ASSIGNMENTS_CONFIG (old format, backwards compatibility)
-    print("\n\n6. ASSIGNMENTS_CONFIG (alternative, for specific assignments only)")
-    print("-" * 80)
+    out.append("\n\n6. ASSIGNMENTS_CONFIG (alternative, for specific assignments only)")
+    out.append(SECTION_RULE)
     assignments_path = Path("assignments_config.json")
+    assignments = None
     if assignments_path.exists():
         try:
             assignments = export_json_file(assignments_path)
-            print("✓ Found assignments_config.json")
-            print("\nCopy this to GitHub Secret 'ASSIGNMENTS_CONFIG':")
-            print("\n" + "─" * 80)
-            print(assignments)
-            print("─" * 80)
-            print("\nNote: This processes specific assignments only")
+            out.append("✓ Found assignments_config.json")
+            out.append("\nCopy this to GitHub Secret 'ASSIGNMENTS_CONFIG':")
+            out.append("\n" + SUB)
+            out.append(assignments)
+            out.append(SUB)
+            out.append("\nNote: This processes specific assignments only")
         except Exception as e:
-            print(f"✗ Error reading assignments_config.json: {e}")
+            out.append(f"✗ Error reading assignments_config.json: {e}")
     else:
-        print("✗ assignments_config.json not found")
-        print("  Not needed if using COURSES_CONFIG (recommended)")
+        out.append("✗ assignments_config.json not found")
+        out.append("  Not needed if using COURSES_CONFIG (recommended)")
+
+    _write_lines(out)
 
     # Summary
-    print("\n" + "=" * 80)
-    print("NEXT STEPS")
-    print("=" * 80)
-    print("\n1. Go to your GitHub repository")
-    print("2. Navigate to: Settings → Secrets and variables → Actions")
-    print("3. Click 'New repository secret'")
-    print("4. Add each secret with the name and value shown above")
-    print("\nRequired secrets:")
-    print("  - GOOGLE_CREDENTIALS")
-    print("  - COURSE_IDS (simplest: just comma-separated course IDs)")
-    print("\nEncryption (choose one):")
-    print("  - DEFAULT_ENCRYPTION_KEY (if USE_DEFAULT_ENCRYPTION_KEY=true)")
-    print("    Simpler: One key for all students")
-    print("  - ENCRYPTION_KEYS (if USE_DEFAULT_ENCRYPTION_KEY=false)")
-    print("    More secure: Per-student keys")
-    print("\nOptional but recommended:")
-    print("  - GOOGLE_TOKEN (avoids re-authentication)")
-    print("  - USE_DEFAULT_ENCRYPTION_KEY (set to 'true' for simpler setup)")
-    print("\nAlternative to COURSE_IDS:")
-    print("  - COURSES_CONFIG (if you want to specify course names)")
-    print("  - ASSIGNMENTS_CONFIG (if you want specific assignments only)")
-    print("\n" + "=" * 80)
+    out.append("\n" + SEP)
+    out.append("NEXT STEPS")
+    out.append(SEP)
+    out.append("\n1. Go to your GitHub repository")
+    out.append("2. Navigate to: Settings → Secrets and variables → Actions")
+    out.append("3. Click 'New repository secret'")
+    out.append("4. Add each secret with the name and value shown above")
+    out.append("\nRequired secrets:")
+    out.append("  - GOOGLE_CREDENTIALS")
+    out.append("  - COURSE_IDS (simplest: just comma-separated course IDs)")
+    out.append("\nEncryption (choose one):")
+    out.append("  - DEFAULT_ENCRYPTION_KEY (if USE_DEFAULT_ENCRYPTION_KEY=true)")
+    out.append("    Simpler: One key for all students")
+    out.append("  - ENCRYPTION_KEYS (if USE_DEFAULT_ENCRYPTION_KEY=false)")
+    out.append("    More secure: Per-student keys")
+    out.append("\nOptional but recommended:")
+    out.append("  - GOOGLE_TOKEN (avoids re-authentication)")
+    out.append("  - USE_DEFAULT_ENCRYPTION_KEY (set to 'true' for simpler setup)")
+    out.append("\nAlternative to COURSE_IDS:")
+    out.append("  - COURSES_CONFIG (if you want to specify course names)")
+    out.append("  - ASSIGNMENTS_CONFIG (if you want specific assignments only)")
+    out.append("\n" + SEP)
+
+    _write_lines(out)
 
     # Save to file for convenience
     output_file = Path("github_secrets_export.txt")
-    with open(output_file, 'w') as f:
-        f.write("GITHUB SECRETS EXPORT\n")
-        f.write("=" * 80 + "\n\n")
+    parts = ["GITHUB SECRETS EXPORT\n", SEP + "\n\n"]
+
+    # Reuse the values computed above instead of re-reading the files
+    if credentials is not None:
+        parts += ["GOOGLE_CREDENTIALS:\n", credentials, "\n\n"]
 
-        if credentials_path.exists():
-            f.write("GOOGLE_CREDENTIALS:\n")
-            f.write(export_json_file(credentials_path) + "\n\n")
+    if token_b64 is not None:
+        parts += ["GOOGLE_TOKEN (base64):\n", token_b64, "\n\n"]
 
-        if token_path.exists():
-            f.write("GOOGLE_TOKEN (base64):\n")
-            f.write(export_file_as_base64(token_path) + "\n\n")
+    if keys_json is None:
+        keys_json, key_count = export_encryption_keys()
+    if key_count:
+        parts += ["ENCRYPTION_KEYS:\n", keys_json, "\n\n"]
 
-        keys_json = export_encryption_keys()
-        if json.loads(keys_json):
-            f.write("ENCRYPTION_KEYS:\n")
-            f.write(keys_json + "\n\n")
+    if assignments is not None:
+        parts += ["ASSIGNMENTS_CONFIG:\n", assignments, "\n\n"]
 
-        if assignments_path.exists():
-            f.write("ASSIGNMENTS_CONFIG:\n")
-            f.write(export_json_file(assignments_path) + "\n\n")
+    # Single write for the whole file
+    with open(output_file, 'wb') as f:
+        f.write(''.join(parts).encode('utf-8'))
 
-    print(f"\n✓ All secrets also saved to: {output_file}")
-    print("  (This file is gitignored for security)")
+    out.append(f"\n✓ All secrets also saved to: {output_file}")
+    out.append("  (This file is gitignored for security)")
+    _write_lines(out)
 
 
 if __name__ == "__main__":
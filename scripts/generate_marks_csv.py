@@ -26,45 +26,105 @@ import csv
 import json
 import os
 import re
+import sqlite3
 import sys
-from collections import defaultdict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+import requests
 from github import Github, GithubException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Add parent directory to path to import ClassroomClient
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
 from src.classroom_client import ClassroomClient
+from src.student_ids import get_student_email_from_id
 
+# Maximum number of concurrent PR comment requests
+MAX_FETCH_WORKERS = 16
 
-def get_student_email_from_id(student_id: str) -> str:
-    """
-    Convert student_id back to email format.
+# Items per REST list page (GitHub maximum)
+GITHUB_PAGE_SIZE = 100
 
-    Args:
-        student_id: Student identifier (email with @ and . replaced)
+# Output buffer size for the marks CSV
+CSV_BUFFER_SIZE = 1 << 20
 
-    Returns:
-        Student email address
-    
-    Note:
-        This conversion has a limitation: it cannot distinguish between
-        underscores that were originally dots and underscores that were
-        already in the email. For example:
-        - 'test_user@example.com' becomes 'test_user_at_example_com' (encoded)
-        - Then converts back to 'test.user@example.com' (incorrect)
-        
-        This matches the behavior in aggregate_grades.py and send_results.py.
-        To avoid issues, student emails should not contain underscores.
-    """
-    # Reverse the transformation done in classroom_client.py:
-    # email.replace('@', '_at_').replace('.', '_')
-    email = student_id.replace('_at_', '@')
-    # Replace remaining underscores with dots
-    # This is a best-effort conversion (see Note in docstring)
-    email = email.replace('_', '.')
-    return email
+# GitHub's updated_at format; the REST datetime is rendered the same way
+UPDATED_AT_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+GITHUB_GRAPHQL_URL = 'https://api.github.com/graphql'
+
+# One keep-alive connection for all GraphQL pages. Queries are read-only,
+# so POST is safe to retry on transient server errors and rate limiting.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(max_retries=Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({'POST'}),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)))
+
+# Newest PRs first, matching the REST listing order. The grade is normally
+# among the last few comments, so only those come with the PR page.
+PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: 100, after: $cursor, states: [OPEN, CLOSED, MERGED],
+                 orderBy: {field: CREATED_AT, direction: DESC}) {
+      totalCount
+      pageInfo { endCursor hasNextPage }
+      nodes {
+        number
+        title
+        updatedAt
+        comments(last: 10) {
+          pageInfo { startCursor hasPreviousPage }
+          nodes { body }
+        }
+      }
+    }
+  }
+}
+"""
+
+PR_COMMENTS_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      comments(last: 100, before: $cursor) {
+        pageInfo { startCursor hasPreviousPage }
+        nodes { body }
+      }
+    }
+  }
+}
+"""
+
+# PR title: "Submission: email - homework"
+_PR_TITLE = re.compile(r'^Submission:\s*([^\s]+)\s*-\s*(.+)$', re.IGNORECASE)
+
+# Score patterns, tried in this order by extract_score_from_comment
+_SCORE_FRAC = re.compile(r'Score:\s*(\d+\.?\d*)\s*/\s*(\d+\.?\d*)', re.IGNORECASE)
+_SCORE_PCT = re.compile(r'Score:\s*(\d+\.?\d*)%', re.IGNORECASE)
+_EARNED = re.compile(
+    r'earned[_\s]*points[:\s]*(\d+\.?\d*).*total[_\s]*points[:\s]*(\d+\.?\d*)',
+    re.IGNORECASE | re.DOTALL
+)
+_KEYWORD_PCT = re.compile(r'(?:score|grade|mark).*?(\d+\.?\d*)%', re.IGNORECASE)
+
+# Literal that each score pattern above requires (cheap prefilter)
+_SCORE_KEYWORDS = ('score', 'earned', 'grade', 'mark')
 
 
 def parse_pr_title(title: str) -> Optional[Tuple[str, str]]:
@@ -79,9 +139,11 @@ def parse_pr_title(title: str) -> Optional[Tuple[str, str]]:
     Returns:
         Tuple of (student_email, homework_name) or None if parsing fails
     """
-    # Pattern: "Submission: email - homework"
-    pattern = r'^Submission:\s*([^\s]+)\s*-\s*(.+)$'
-    match = re.match(pattern, title, re.IGNORECASE)
+    # Most PRs are not submissions; reject them before running the regex
+    if len(title) < 12 or title[:11].casefold() != 'submission:':
+        return None
+
+    match = _PR_TITLE.match(title)
     
     if match:
         student_email = match.group(1).strip()
@@ -106,9 +168,19 @@ def extract_score_from_comment(comment_body: str) -> Optional[float]:
     Returns:
         Score as percentage (0-100) or None if not found
     """
+    # Every pattern needs one of these keywords; skip ordinary comments
+    # without running any regex (casefold matches re.IGNORECASE folding)
+    folded = comment_body.casefold()
+    if not any(keyword in folded for keyword in _SCORE_KEYWORDS):
+        return None
+
+    # Each pattern below is only run when the literals it needs are present,
+    # so a comment is not rescanned by patterns that cannot match it
+    has_score = 'score' in folded
+    has_percent = '%' in comment_body
+    
     # Pattern 1: "Score: X/Y" or "Score: X / Y"
-    pattern1 = r'Score:\s*(\d+\.?\d*)\s*/\s*(\d+\.?\d*)'
-    match = re.search(pattern1, comment_body, re.IGNORECASE)
+    match = _SCORE_FRAC.search(comment_body) if has_score and '/' in comment_body else None
     if match:
         earned = float(match.group(1))
         total = float(match.group(2))
@@ -116,14 +188,12 @@ def extract_score_from_comment(comment_body: str) -> Optional[float]:
             return (earned / total) * 100
     
     # Pattern 2: "Score: X%"
-    pattern2 = r'Score:\s*(\d+\.?\d*)%'
-    match = re.search(pattern2, comment_body, re.IGNORECASE)
+    match = _SCORE_PCT.search(comment_body) if has_score and has_percent else None
     if match:
         return float(match.group(1))
     
     # Pattern 3: "earned_points: X, total_points: Y" (from grade_report)
-    pattern3 = r'earned[_\s]*points[:\s]*(\d+\.?\d*).*total[_\s]*points[:\s]*(\d+\.?\d*)'
-    match = re.search(pattern3, comment_body, re.IGNORECASE | re.DOTALL)
+    match = _EARNED.search(comment_body) if 'earned' in folded and 'total' in folded else None
     if match:
         earned = float(match.group(1))
         total = float(match.group(2))
@@ -131,8 +201,7 @@ def extract_score_from_comment(comment_body: str) -> Optional[float]:
             return (earned / total) * 100
     
     # Pattern 4: Look for percentage with score keyword
-    pattern4 = r'(?:score|grade|mark).*?(\d+\.?\d*)%'
-    match = re.search(pattern4, comment_body, re.IGNORECASE)
+    match = _KEYWORD_PCT.search(comment_body) if has_percent else None
     if match:
         return float(match.group(1))
     
@@ -164,25 +233,20 @@ def get_classroom_student_names(classroom_client: Optional[ClassroomClient],
         # Get all students in the course
         students = classroom_client.list_students(course_id)
         
-        # Build a mapping of email to name
+        # Keep only the names of students in our list, matching in one pass
+        wanted = {email.lower(): email for email in student_emails}
         for student in students:
             profile = student.get('profile', {})
             email = profile.get('emailAddress', '').lower()
-            name_obj = profile.get('name', {})
-            full_name = name_obj.get('fullName', '')
+            if email not in wanted:
+                continue
+            full_name = profile.get('name', {}).get('fullName', '')
             
-            if email and full_name:
+            if full_name:
                 student_names[email] = full_name
+                print(f"   ✓ {wanted[email]}: {full_name}")
         
-        # Match with our student list
-        found_count = 0
-        for email in student_emails:
-            email_lower = email.lower()
-            if email_lower in student_names:
-                found_count += 1
-                print(f"   ✓ {email}: {student_names[email_lower]}")
-        
-        print(f"   Found {found_count}/{len(student_emails)} student names")
+        print(f"   Found {len(student_names)}/{len(student_emails)} student names")
         
     except Exception as e:
         print(f"   ⚠️  Error fetching names from Classroom: {e}")
@@ -196,30 +260,272 @@ def extract_score_from_pr(pr) -> Optional[float]:
     Extract score from a PR by checking comments.
     
     Args:
-        pr: PR object from PyGithub
+        pr: The PR's Issue object from PyGithub (as listed by get_issues)
         
     Returns:
         Score as percentage or None
     """
-    # Get all comments (issue comments on the PR)
-    comments = list(pr.get_issue_comments())
-    
-    if not comments:
+    # The listing carries the comment count; skip the request when it is 0
+    if pr.comments == 0:
         return None
     
-    # Check last comment first (most recent grade)
-    for comment in reversed(comments):
-        score = extract_score_from_comment(comment.body)
-        if score is not None:
-            return score
+    # Check last comment first (most recent grade). The comment count says
+    # which page is the last one, so pages are read newest first and older
+    # pages are only fetched while no comment has had a score. (The list's
+    # .reversed would spend an extra request looking up the last page.)
+    comments = pr.get_comments()
+    for page in range((pr.comments - 1) // GITHUB_PAGE_SIZE, -1, -1):
+        for comment in reversed(comments.get_page(page)):
+            score = extract_score_from_comment(comment.body)
+            if score is not None:
+                return score
     
     return None
 
 
+def load_score_cache(cache_path: Path, repo_name: str) -> Dict[int, Tuple[str, Optional[float]]]:
+    """
+    Load cached PR scores of a repository.
+    
+    Args:
+        cache_path: Path to the SQLite cache file
+        repo_name: Repository in format "owner/repo"
+        
+    Returns:
+        Dictionary mapping PR number to (updated_at, score)
+    """
+    if not cache_path.exists():
+        return {}
+    
+    conn = sqlite3.connect(cache_path)
+    try:
+        rows = conn.execute(
+            'SELECT number, updated_at, score FROM pr WHERE repo = ?', (repo_name,)
+        ).fetchall()
+    except sqlite3.Error:
+        # No table yet or not a cache file: fetch everything
+        return {}
+    finally:
+        conn.close()
+    return {number: (updated_at, score) for number, updated_at, score in rows}
+
+
+def save_score_cache(cache_path: Path, repo_name: str,
+                     cache: Dict[int, Tuple[str, Optional[float]]]):
+    """
+    Store PR scores so the next run only fetches PRs updated since.
+    
+    Args:
+        cache_path: Path to the SQLite cache file
+        repo_name: Repository in format "owner/repo"
+        cache: Dictionary mapping PR number to (updated_at, score)
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    try:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS pr ('
+            'repo TEXT, number INTEGER, updated_at TEXT, score REAL, '
+            'PRIMARY KEY (repo, number))'
+        )
+        conn.executemany(
+            'INSERT OR REPLACE INTO pr VALUES (?, ?, ?, ?)',
+            ((repo_name, number, updated_at, score)
+             for number, (updated_at, score) in cache.items())
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def fetch_pr_scores_rest(repo_name: str, token: str,
+                         cache: Optional[Dict[int, Tuple[str, Optional[float]]]] = None
+                         ) -> Tuple[int, List[Tuple[Tuple[str, str], Optional[float]]]]:
+    """
+    Fetch submission PRs and their scores with the REST API (PyGithub).
+    
+    Args:
+        repo_name: Repository in format "owner/repo"
+        token: GitHub API token
+        cache: PR number -> (updated_at, score); PRs not updated since are
+            not fetched again, and new scores are added to it
+        
+    Returns:
+        Tuple of (total PR count, [((student_id, homework_name), score)])
+    """
+    # Initialize GitHub client (100 items per page = fewer list requests,
+    # one pooled connection per fetch worker)
+    g = Github(token, per_page=GITHUB_PAGE_SIZE, pool_size=MAX_FETCH_WORKERS)
+    repo = g.get_repo(repo_name)
+    
+    # Get all PRs (open and closed) through the issues listing, which unlike
+    # the pulls listing includes each PR's comment count. Counts come from
+    # the Link rel="last" header, so all list pages can be requested at once.
+    total_prs = repo.get_pulls(state='all').totalCount
+    issues = repo.get_issues(state='all')
+    page_count = -(-issues.totalCount // GITHUB_PAGE_SIZE)
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        prs = [issue for page in executor.map(issues.get_page, range(page_count)) for issue in page]
+    
+    if cache is None:
+        cache = {}
+    
+    # Only submission PRs updated since the last run need their comments fetched
+    submissions = []
+    to_fetch = []
+    for pr in prs:
+        parsed = parse_pr_title(pr.title)
+        # Plain issues have no pull_request link (checked after the title,
+        # since reading it from a plain issue costs a request)
+        if parsed and pr.pull_request is not None:
+            submissions.append((pr, parsed))
+            cached = cache.get(pr.number)
+            if not cached or cached[0] != pr.updated_at.strftime(UPDATED_AT_FORMAT):
+                to_fetch.append(pr)
+    
+    failed = set()
+    
+    def fetch_score(pr) -> Optional[float]:
+        """
+        Extract the score of one PR, waiting once for a rate limit reset.
+        
+        A PR whose comments cannot be read is reported and scored as None,
+        so one failure does not abort the whole batch.
+        """
+        for attempt in range(2):
+            try:
+                return extract_score_from_pr(pr)
+            except GithubException as e:
+                if e.status == 403 and attempt == 0:
+                    time.sleep(max(0, g.rate_limiting_resettime - time.time()) + 1)
+                    continue
+                print(f"   ⚠ PR #{pr.number}: could not read comments ({e.status})")
+                failed.add(pr.number)
+                return None
+    
+    # Each PR with comments costs a comments request; overlap them
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        scores = {pr.number: score for pr, score in zip(to_fetch, executor.map(fetch_score, to_fetch))}
+    
+    scored = []
+    for pr, parsed in submissions:
+        if pr.number in scores:
+            score = scores[pr.number]
+            if pr.number not in failed:
+                cache[pr.number] = (pr.updated_at.strftime(UPDATED_AT_FORMAT), score)
+        else:
+            score = cache[pr.number][1]
+        scored.append((parsed, score))
+    
+    return total_prs, scored
+
+
+def _graphql(token: str, query: str, variables: Dict) -> Dict:
+    """
+    Run a GitHub GraphQL query.
+    
+    Args:
+        token: GitHub API token
+        query: GraphQL query text
+        variables: Query variables
+        
+    Returns:
+        The "data" object of the response
+    """
+    response = _SESSION.post(
+        GITHUB_GRAPHQL_URL,
+        json={'query': query, 'variables': variables},
+        headers={'Authorization': f'bearer {token}'},
+        timeout=60
+    )
+    response.raise_for_status()
+    # Parse the raw bytes; skips requests' text decoding and stdlib json
+    payload = _loads(response.content)
+    if payload.get('errors'):
+        raise RuntimeError(f"GraphQL error: {payload['errors'][0].get('message')}")
+    return payload['data']
+
+
+def fetch_pr_scores_graphql(repo_name: str, token: str,
+                            cache: Optional[Dict[int, Tuple[str, Optional[float]]]] = None
+                            ) -> Tuple[int, List[Tuple[Tuple[str, str], Optional[float]]]]:
+    """
+    Fetch submission PRs and their scores with the GraphQL API.
+    
+    One request returns titles and the latest 10 comments of 100 PRs,
+    instead of one REST request per PR. Older comments are only requested
+    for PRs whose latest comments contain no score.
+    
+    Args:
+        repo_name: Repository in format "owner/repo"
+        token: GitHub API token
+        cache: PR number -> (updated_at, score); comments of PRs not updated
+            since are not scanned again, and new scores are added to it
+        
+    Returns:
+        Tuple of (total PR count, [((student_id, homework_name), score)])
+    """
+    if cache is None:
+        cache = {}
+    
+    owner, name = repo_name.split('/', 1)
+    variables = {'owner': owner, 'name': name, 'cursor': None}
+    
+    total_prs = 0
+    scored = []
+    while True:
+        pull_requests = _graphql(token, PULL_REQUESTS_QUERY, variables)['repository']['pullRequests']
+        total_prs = pull_requests['totalCount']
+        
+        for node in pull_requests['nodes']:
+            parsed = parse_pr_title(node['title'])
+            if not parsed:
+                continue
+            
+            cached = cache.get(node['number'])
+            if cached and cached[0] == node['updatedAt']:
+                scored.append((parsed, cached[1]))
+                continue
+            
+            # Newest comments first, paging back only while no score is found
+            comments = node['comments']
+            score = None
+            while True:
+                for comment in reversed(comments['nodes']):
+                    score = extract_score_from_comment(comment['body'])
+                    if score is not None:
+                        break
+                if score is not None or not comments['pageInfo']['hasPreviousPage']:
+                    break
+                comments = _graphql(token, PR_COMMENTS_QUERY, {
+                    'owner': owner, 'name': name, 'number': node['number'],
+                    'cursor': comments['pageInfo']['startCursor']
+                })['repository']['pullRequest']['comments']
+            
+            cache[node['number']] = (node['updatedAt'], score)
+            scored.append((parsed, score))
+        
+        if not pull_requests['pageInfo']['hasNextPage']:
+            break
+        variables['cursor'] = pull_requests['pageInfo']['endCursor']
+    
+    return total_prs, scored
+
+
+# PR score fetchers by API name; both share the same signature and caching
+PR_SCORE_FETCHERS = {
+    'graphql': fetch_pr_scores_graphql,
+    'rest': fetch_pr_scores_rest,
+}
+
+
 def generate_marks_csv(repo_name: str, token: str, output_file: str, 
                        course_id: str = None,
                        credentials_path: str = None,
-                       token_path: str = None):
+                       token_path: str = None,
+                       api: str = 'graphql',
+                       cache_path: str = None,
+                       quiet: bool = False):
     """
     Generate CSV file with student marks from PRs.
     
@@ -230,43 +536,55 @@ def generate_marks_csv(repo_name: str, token: str, output_file: str,
         course_id: Google Classroom course ID (optional, for fetching student names)
         credentials_path: Path to Google Classroom credentials (optional)
         token_path: Path to Google Classroom token (optional)
+        api: GitHub API used to read PRs: 'graphql' (default) or 'rest'
+        cache_path: SQLite file with scores from earlier runs (optional);
+            only PRs updated since are fetched again
+        quiet: Do not print a line per submission PR
     """
     print(f"🔍 Fetching PRs from {repo_name}...")
     
-    # Initialize GitHub client
-    g = Github(token)
-    repo = g.get_repo(repo_name)
+    cache = load_score_cache(Path(cache_path), repo_name) if cache_path else {}
     
-    # Get all PRs (open and closed)
-    prs = list(repo.get_pulls(state='all'))
-    print(f"   Found {len(prs)} PRs")
+    total_prs, scored = PR_SCORE_FETCHERS[api](repo_name, token, cache)
+    print(f"   Found {total_prs} PRs")
+    
+    if cache_path:
+        try:
+            save_score_cache(Path(cache_path), repo_name, cache)
+        except sqlite3.Error as e:
+            print(f"   ⚠️  Could not update score cache {cache_path}: {e}")
     
     # Parse PRs and extract marks
-    marks = defaultdict(dict)  # {student_email: {homework: score}}
-    homework_set = set()
+    homework_index: Dict[str, int] = {}  # {homework: column}
+    marks: Dict[str, List[str]] = {}  # {student_email: [CSV cell per column]}
     
     print("\n📊 Processing PRs...")
-    for pr in prs:
-        title = pr.title
-        parsed = parse_pr_title(title)
-        
-        if not parsed:
-            continue
-        
-        student_id, homework_name = parsed
-        
+    # Per-PR lines are written in one call after the loop
+    progress: List[str] = []
+    for (student_id, homework_name), score in scored:
         # Convert student_id to proper email format
         student_email = get_student_email_from_id(student_id)
         
-        # Extract score from PR
-        score = extract_score_from_pr(pr)
-        
         if score is not None:
-            marks[student_email][homework_name] = score
-            homework_set.add(homework_name)
-            print(f"   ✓ {student_email} - {homework_name}: {score:.1f}%")
-        else:
-            print(f"   ⚠ {student_email} - {homework_name}: No score found")
+            column = homework_index.get(homework_name)
+            if column is None:
+                # New homework: add a column to every student seen so far
+                column = homework_index[homework_name] = len(homework_index)
+                for student_scores in marks.values():
+                    student_scores.append('')
+            
+            student_scores = marks.get(student_email)
+            if student_scores is None:
+                student_scores = marks[student_email] = [''] * len(homework_index)
+            # Formatted once here; empty cells need no work when writing
+            student_scores[column] = f'{score:.1f}'
+            if not quiet:
+                progress.append(f"   ✓ {student_email} - {homework_name}: {score:.1f}%")
+        elif not quiet:
+            progress.append(f"   ⚠ {student_email} - {homework_name}: No score found")
+    
+    if progress:
+        sys.stdout.write('\n'.join(progress) + '\n')
     
     # Fetch student names from Google Classroom if credentials provided
     student_names = {}
@@ -292,8 +610,11 @@ def generate_marks_csv(repo_name: str, token: str, output_file: str,
         return
     
     # Sort students and homeworks for consistent output
-    students = sorted(marks.keys())
-    homeworks = sorted(homework_set)
+    students = list(marks)
+    students.sort()
+    homeworks = list(homework_index)
+    homeworks.sort()
+    columns = [homework_index[homework] for homework in homeworks]
     
     # Create output directory if needed
     output_path = Path(output_file)
@@ -301,38 +622,32 @@ def generate_marks_csv(repo_name: str, token: str, output_file: str,
     
     # Write CSV
     print(f"\n📝 Writing CSV to {output_file}...")
-    with open(output_file, 'w', newline='') as f:
+    with open(output_file, 'w', newline='', buffering=CSV_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         
         # Header row - include Name if any names were found
         if student_names:
             header = ['Student Name', 'Student Email'] + homeworks
+            rows = (
+                [student_names.get(student, ''), student,
+                 *map(marks[student].__getitem__, columns)]
+                for student in students
+            )
         else:
             header = ['Student Email'] + homeworks
-        writer.writerow(header)
+            rows = (
+                [student, *map(marks[student].__getitem__, columns)]
+                for student in students
+            )
         
-        # Data rows
-        for student in students:
-            if student_names:
-                # Include name column
-                name = student_names.get(student, '')
-                row = [name, student]
-            else:
-                # Email only
-                row = [student]
-            
-            for homework in homeworks:
-                score = marks[student].get(homework, '')
-                if score != '':
-                    row.append(f'{score:.1f}')
-                else:
-                    row.append('')
-            writer.writerow(row)
+        # Header and data rows in one writerows call
+        writer.writerows(chain((header,), rows))
     
     print(f"\n✅ CSV generated successfully!")
     print(f"   Students: {len(students)}")
     print(f"   Homeworks: {len(homeworks)}")
-    print(f"   Total submissions: {sum(len(hw) for hw in marks.values())}")
+    # Every filled cell is one (student, homework) submission
+    print(f"   Total submissions: {sum(map(bool, chain.from_iterable(marks.values())))}")
 
 
 def main():
@@ -362,6 +677,22 @@ def main():
         default='credentials.json',
         help='Path to Google Classroom credentials.json (default: credentials.json)'
     )
+    parser.add_argument(
+        '--api',
+        choices=sorted(PR_SCORE_FETCHERS),
+        default='graphql',
+        help='GitHub API used to read PRs (default: graphql, one request per 100 PRs)'
+    )
+    parser.add_argument(
+        '--cache',
+        metavar='PATH',
+        help='SQLite score cache (e.g. reports/.marks_cache.sqlite); PRs not updated since the last run are not fetched again (default: no cache)'
+    )
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Only print the summary, not a line per submission PR'
+    )
     parser.add_argument(
         '--classroom-token',
         default='token.json',
@@ -384,9 +715,12 @@ def main():
             args.output,
             course_id=args.course_id,
             credentials_path=args.credentials if args.course_id else None,
-            token_path=args.classroom_token if args.course_id else None
+            token_path=args.classroom_token if args.course_id else None,
+            api=args.api,
+            cache_path=args.cache,
+            quiet=args.quiet
         )
-    except GithubException as e:
+    except (GithubException, requests.RequestException) as e:
         print(f"\n❌ GitHub API error: {e}")
         sys.exit(1)
     except Exception as e:
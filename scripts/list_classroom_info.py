@@ -3,23 +3,39 @@
 Helper script to list Google Classroom courses and assignments with their IDs.
 Use this to find the course_id and coursework_id for assignments_config.json
 """
+import functools
 import sys
-from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
 
 from src.classroom_client import ClassroomClient
 
 
+@functools.lru_cache(maxsize=1)
+def _client() -> ClassroomClient:
+    """Shared client, so credentials are loaded and the services built once."""
+    return ClassroomClient()
+
+
+@functools.lru_cache(maxsize=1)
+def _courses():
+    """Courses of the session, fetched once."""
+    return _client().list_courses()
+
+
+@functools.lru_cache(maxsize=None)
+def _course_work(course_id: str):
+    """Coursework of a course, fetched once per course per session."""
+    return _client().list_course_work(course_id)
+
+
 def list_all_courses():
     """List all available courses."""
     print("=" * 80)
     print("GOOGLE CLASSROOM COURSES")
     print("=" * 80)
 
-    client = ClassroomClient()
-    courses = client.list_courses()
+    courses = _courses()
 
     if not courses:
         print("\nNo courses found.")
@@ -50,8 +66,7 @@ def list_coursework_for_course(course_id: str, course_name: str = None):
         print(f"ASSIGNMENTS FOR COURSE: {course_id}")
     print("=" * 80)
 
-    client = ClassroomClient()
-    coursework = client.list_course_work(course_id)
+    coursework = _course_work(course_id)
 
     if not coursework:
         print("\nNo assignments found in this course.")
@@ -3,14 +3,37 @@
 Simple script to re-encrypt existing submissions with current key and push to GitHub.
 This fixes the key mismatch issue.
 """
-import sys
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
 
 from src.encryption import EncryptionManager
 
+
+@functools.lru_cache(maxsize=None)
+def _get_worker_manager(student_id: str, key: bytes) -> EncryptionManager:
+    """Get the EncryptionManager of the current worker process."""
+    # key is already decoded; from_keys would decode it a second time
+    return EncryptionManager.from_raw_keys({student_id: key})
+
+
+def _encrypt_one(task) -> bool:
+    """
+    Encrypt a single notebook; runs in a worker process.
+
+    Args:
+        task: Tuple of (notebook_path, encrypted_path, student_id, key)
+
+    Returns:
+        True if the file was encrypted
+    """
+    notebook, encrypted_path, student_id, key = task
+    return _get_worker_manager(student_id, key).encrypt_file(notebook, encrypted_path, student_id)
+
+
 def main():
     # Setup encryption with default key
     encryption = EncryptionManager(use_default_key=True)
@@ -22,36 +45,50 @@ def main():
         print("No submissions directory found")
         return
 
-    # Process each student/assignment
-    for student_dir in submissions_dir.iterdir():
-        if not student_dir.is_dir():
-            continue
+    # Resolve (or create) the default key once, so every worker uses the same key
+    key = encryption.get_or_create_key('')
 
-        student_id = student_dir.name
-        print(f"\nProcessing student: {student_id}")
-
-        for assignment_dir in student_dir.iterdir():
-            if not assignment_dir.is_dir():
+    # Collect every student/assignment notebook first; DirEntry caches the
+    # file type from the directory listing, so no per-entry stat is needed
+    tasks = []
+    with os.scandir(submissions_dir) as students:
+        for student_entry in students:
+            if not student_entry.is_dir():
                 continue
 
-            assignment_id = assignment_dir.name
-            print(f"  Assignment: {assignment_id}")
+            student_id = student_entry.name
+
+            with os.scandir(student_entry.path) as assignments:
+                for assignment_entry in assignments:
+                    if not assignment_entry.is_dir():
+                        continue
 
-            # Find .ipynb files
-            for notebook in assignment_dir.glob("*.ipynb"):
-                encrypted_path = notebook.parent / f"{notebook.name}.enc"
+                    # Find .ipynb files (hidden ones excluded, as glob did)
+                    with os.scandir(assignment_entry.path) as files:
+                        for file_entry in files:
+                            name = file_entry.name
+                            if (name.endswith('.ipynb') and not name.startswith('.')
+                                    and file_entry.is_file()):
+                                notebook = Path(file_entry.path)
+                                encrypted_path = Path(f"{file_entry.path}.enc")
+                                tasks.append((notebook, encrypted_path, student_id, key))
 
-                # Encrypt
-                success = encryption.encrypt_file(
-                    notebook,
-                    encrypted_path,
-                    student_id
-                )
+    # Files are independent and encryption is CPU-bound, so use all cores;
+    # results arrive in task order and are printed as they complete
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        current_student = current_assignment = None
+        for (notebook, _, student_id, _), success in zip(tasks, executor.map(_encrypt_one, tasks)):
+            if student_id != current_student:
+                current_student, current_assignment = student_id, None
+                print(f"\nProcessing student: {student_id}")
+            if notebook.parent.name != current_assignment:
+                current_assignment = notebook.parent.name
+                print(f"  Assignment: {current_assignment}")
 
-                if success:
-                    print(f"    ✓ Encrypted: {notebook.name}")
-                else:
-                    print(f"    ✗ Failed: {notebook.name}")
+            if success:
+                print(f"    ✓ Encrypted: {notebook.name}")
+            else:
+                print(f"    ✗ Failed: {notebook.name}")
 
     print("\n" + "="*80)
     print("Re-encryption complete!")
@@ -4,96 +4,107 @@ Script to run the grader on decrypted submissions.
 """
 import argparse
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
 
 from src.grader import NotebookGrader
+from src.report_json import dumps_report
 
 
-def grade_submission(student_id: str, assignment_id: str, output_path: str):
+def build_grading_result(student_id: str, assignment_id: str) -> Dict[str, Any]:
     """
-    Grade a student's submission.
+    Grade a student's submission without printing or saving anything.
+
+    Safe to run in a worker process.
 
     Args:
         student_id: Student identifier (email-based)
         assignment_id: Assignment identifier (name-based)
-        output_path: Path to save the grading report
+
+    Returns:
+        Grading result dictionary
     """
     grader = NotebookGrader()
 
     # Find decrypted notebook
     # Note: assignment_id is actually the assignment name now
     decrypted_dir = Path("decrypted_submissions") / student_id / assignment_id
-    notebooks = list(decrypted_dir.glob("*.ipynb"))
+    # Grade the first notebook found (or you can modify to grade all);
+    # hidden files are skipped
+    notebook_path = next(decrypted_dir.glob("[!.]*.ipynb"), None)
 
-    if not notebooks:
-        result = {
+    if notebook_path is None:
+        return {
             "error": "No Jupyter notebooks found in submission",
             "student_id": student_id,
             "assignment_id": assignment_id,
             "score": 0.0,
             "passed": False,
         }
-    else:
-        # Grade the first notebook found (or you can modify to grade all)
-        notebook_path = notebooks[0]
-        print(f"Grading notebook: {notebook_path}")
-
-        # Load expected outputs for this assignment
-        # Try assignment name first, then fall back to numeric ID if it exists
-        expected_path = Path("test_cases") / assignment_id / "expected_output.json"
-
-        if not expected_path.exists():
-            print(f"Warning: No expected output file found at {expected_path}")
-            print("Tip: Create test_cases/{assignment_name}/expected_output.json")
-            print("Executing notebook without comparison...")
-
-            # Execute notebook without grading
-            executed_nb = grader.execute_notebook(notebook_path)
-            if executed_nb:
-                student_outputs = grader.extract_json_outputs(executed_nb)
-                result = {
-                    "student_id": student_id,
-                    "assignment_id": assignment_id,
-                    "notebook": str(notebook_path),
-                    "student_outputs": student_outputs,
-                    "note": "No expected outputs available for comparison",
-                    "passed": True,
-                }
-            else:
-                result = {
-                    "error": "Failed to execute notebook",
-                    "student_id": student_id,
-                    "assignment_id": assignment_id,
-                    "score": 0.0,
-                    "passed": False,
-                }
-        else:
-            # Grade with expected outputs
-            result = grader.grade_notebook(notebook_path, expected_path)
-            result["student_id"] = student_id
-            result["assignment_id"] = assignment_id
 
-    # Save report
+    # Load expected outputs for this assignment
+    expected_path = Path("test_cases") / assignment_id / "expected_output.json"
+
+    if not expected_path.exists():
+        # Execute notebook without grading
+        executed_nb = grader.execute_notebook(notebook_path)
+        if executed_nb:
+            student_outputs = grader.extract_json_outputs(executed_nb)
+            return {
+                "student_id": student_id,
+                "assignment_id": assignment_id,
+                "notebook": str(notebook_path),
+                "student_outputs": student_outputs,
+                "note": "No expected outputs available for comparison",
+                "passed": True,
+            }
+        return {
+            "error": "Failed to execute notebook",
+            "student_id": student_id,
+            "assignment_id": assignment_id,
+            "score": 0.0,
+            "passed": False,
+        }
+
+    # Grade with expected outputs
+    result = grader.grade_notebook(notebook_path, expected_path)
+    result["student_id"] = student_id
+    result["assignment_id"] = assignment_id
+    return result
+
+
+def save_report(result: Dict[str, Any], output_path: str):
+    """
+    Save a grading report as JSON.
+
+    Args:
+        result: Grading result dictionary
+        output_path: Path to save the grading report
+    """
     output = Path(output_path)
     output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(json.dumps(result, indent=2))
+    # Write next to the report and rename into place, so a killed job never
+    # leaves a partial report for send_results to read
+    tmp_path = output.with_name(output.name + '.tmp')
+    tmp_path.write_bytes(dumps_report(result))
+    os.replace(tmp_path, output)
 
-    # Print human-readable report
-    print("\n" + "=" * 60)
-    if "error" in result:
-        print(f"ERROR: {result['error']}")
-    elif "note" in result:
-        print(result["note"])
-        print(f"Student outputs: {json.dumps(result.get('student_outputs', []), indent=2)}")
-    else:
-        print(grader.generate_report(result))
 
-    print(f"\nReport saved to: {output_path}")
+def get_final_score(result: Dict[str, Any]) -> float:
+    """
+    Get the score of a grading result, raising if grading failed.
+
+    Args:
+        result: Grading result dictionary
 
+    Returns:
+        Earned points (enhanced format) or percentage score (legacy format)
+    """
     if result.get("error"):
         raise RuntimeError(result["error"])
 
@@ -116,14 +127,139 @@ def grade_submission(student_id: str, assignment_id: str, output_path: str):
     return result.get("score", 0.0)
 
 
+def grade_submission(student_id: str, assignment_id: str, output_path: str):
+    """
+    Grade a student's submission.
+
+    Args:
+        student_id: Student identifier (email-based)
+        assignment_id: Assignment identifier (name-based)
+        output_path: Path to save the grading report
+    """
+    print(f"Grading submission: {student_id}/{assignment_id}")
+    result = build_grading_result(student_id, assignment_id)
+    save_report(result, output_path)
+
+    # Print human-readable report
+    print("\n" + "=" * 60)
+    if "error" in result:
+        print(f"ERROR: {result['error']}")
+    elif "note" in result:
+        print(f"Warning: No expected output file found for {assignment_id}")
+        print("Tip: Create test_cases/{assignment_name}/expected_output.json")
+        print(result["note"])
+        print(f"Student outputs: {json.dumps(result.get('student_outputs', []), indent=2)}")
+    else:
+        print(NotebookGrader().generate_report(result))
+
+    print(f"\nReport saved to: {output_path}")
+
+    return get_final_score(result)
+
+
+def _grade_and_save(student_id: str, assignment_id: str, output_path: str) -> Dict[str, Any]:
+    """Grade one submission and save its report; runs in a worker process."""
+    result = build_grading_result(student_id, assignment_id)
+    save_report(result, output_path)
+    return result
+
+
+def grade_submissions_batch(pairs: Iterable[Tuple[str, str]], output_dir: str,
+                            max_workers: int = None) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Grade many submissions in parallel, one worker process per notebook.
+
+    Each report is saved to ``output_dir/<student_id>/<assignment_id>.json``.
+
+    Args:
+        pairs: (student_id, assignment_id) tuples to grade
+        output_dir: Directory to save the grading reports
+        max_workers: Number of worker processes (default: number of CPUs)
+
+    Returns:
+        Grading results keyed by (student_id, assignment_id)
+    """
+    results = {}
+    # Creating a grader registers the kernel if it is missing; do it once
+    # here rather than in every worker at the same time
+    NotebookGrader()
+    # Notebook execution is CPU-heavy and every submission is independent
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(
+                _grade_and_save, student_id, assignment_id,
+                str(Path(output_dir) / student_id / f"{assignment_id}.json")
+            ): (student_id, assignment_id)
+            for student_id, assignment_id in pairs
+        }
+        for future in as_completed(futures):
+            student_id, assignment_id = key = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {
+                    "error": f"Grading crashed: {e}",
+                    "student_id": student_id,
+                    "assignment_id": assignment_id,
+                    "score": 0.0,
+                    "passed": False,
+                }
+            results[key] = result
+            try:
+                print(f"✓ {student_id}/{assignment_id}: {get_final_score(result)}")
+            except RuntimeError as e:
+                print(f"✗ {student_id}/{assignment_id}: {e}")
+    return results
+
+
+def main_batch(batch_path: str, output_dir: str, max_workers: int = None):
+    """
+    Grade every submission listed in a JSON file.
+
+    Args:
+        batch_path: JSON file with a list of [student_id, assignment_id] pairs
+        output_dir: Directory to save the grading reports
+        max_workers: Number of worker processes (default: number of CPUs)
+    """
+    with open(batch_path) as f:
+        pairs = [tuple(pair) for pair in json.load(f)]
+
+    print(f"Grading {len(pairs)} submissions...")
+    results = grade_submissions_batch(pairs, output_dir, max_workers)
+
+    failed = 0
+    for result in results.values():
+        try:
+            get_final_score(result)
+        except RuntimeError:
+            failed += 1
+    print(f"\nGraded {len(results)} submissions, {failed} failed")
+    print(f"Reports saved to: {output_dir}")
+
+    if failed:
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Grade student notebook submission")
-    parser.add_argument("--student-id", required=True, help="Student ID")
-    parser.add_argument("--assignment-id", required=True, help="Assignment ID")
-    parser.add_argument("--output", required=True, help="Output path for grading report")
+    parser.add_argument("--student-id", help="Student ID")
+    parser.add_argument("--assignment-id", help="Assignment ID")
+    parser.add_argument("--output", required=True,
+                        help="Output path for grading report (reports directory with --batch)")
+    parser.add_argument("--batch",
+                        help="JSON file with a list of [student_id, assignment_id] pairs to grade in parallel")
+    parser.add_argument("--max-workers", type=int, default=None,
+                        help="Worker processes for --batch (default: number of CPUs)")
 
     args = parser.parse_args()
 
+    if args.batch:
+        main_batch(args.batch, args.output, args.max_workers)
+        return
+
+    if not args.student_id or not args.assignment_id:
+        parser.error("--student-id and --assignment-id are required without --batch")
+
     try:
         score = grade_submission(args.student_id, args.assignment_id, args.output)
         print(f"\nFinal Score: {score}%")
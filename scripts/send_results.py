@@ -7,31 +7,141 @@ import json
 import sys
 import os
 import csv
+import functools
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    # Incremental parser: reads the report's summary fields without
+    # building its (possibly large) student_outputs
+    import ijson
+except ImportError:
+    ijson = None
+
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
 
 from src.classroom_client import ClassroomClient
+from src.report_json import loads_report
+from src.student_ids import get_student_email_from_id
+
+# Assignment configuration file used when no environment config is set
+COURSES_CONFIG_PATH = Path('courses_config.json')
+
+# Top-level report fields used to display and submit a grade
+_REPORT_FIELDS = frozenset({
+    'error', 'score', 'earned_points', 'total_points', 'passed_cases',
+    'total_test_cases', 'matches', 'total_expected',
+})
+
+# ijson events carrying a scalar value
+_SCALAR_EVENTS = frozenset({'null', 'boolean', 'integer', 'double', 'number', 'string'})
+
+# Delimiters of the assignment metadata block in a submission PR body
+_METADATA_START = '<!-- METADATA\n'
+_METADATA_END = '\n-->'
+
+
+@functools.lru_cache(maxsize=1)
+def _load_courses_config(mtime_ns: int) -> dict:
+    """Parsed courses_config.json; re-read only when its mtime changes."""
+    return _loads(COURSES_CONFIG_PATH.read_bytes())
+
+
+@functools.lru_cache(maxsize=None)
+def _get_repo(token: str, repo_name: str):
+    """GitHub repository, with one client (and connection pool) per token."""
+    # Imported here so runs outside a PR do not load PyGithub
+    from github import Github
 
+    return Github(token).get_repo(repo_name)
 
-def get_student_email_from_id(student_id: str) -> str:
+
+def parse_pr_metadata(body: str) -> dict:
     """
-    Convert student_id back to email format.
+    Parse the key: value lines of the metadata block in a PR body.
 
     Args:
-        student_id: Student identifier (email with @ and . replaced)
+        body: PR body text
 
     Returns:
-        Student email address
+        Metadata dictionary (empty if the body has no metadata block)
+    """
+    # Most PR bodies have no metadata; a substring check skips them cheaply
+    _, start, rest = body.partition(_METADATA_START)
+    if not start:
+        return {}
+    metadata_text, end, _ = rest.partition(_METADATA_END)
+    if not end:
+        return {}
+
+    return {
+        key.strip(): value.strip()
+        for key, sep, value in (line.partition(':') for line in metadata_text.splitlines())
+        if sep
+    }
+
+
+def load_report(report_file: Path) -> dict:
     """
-    # Reverse the transformation done in classroom_client.py:
-    # email.replace('@', '_at_').replace('.', '_')
-    # First replace _at_ with @, then replace remaining _ with .
-    email = student_id.replace('_at_', '@')
-    email = email.replace('_', '.')
-    return email
+    Load the summary fields of a grading report.
+
+    With ijson installed only the top-level scalar fields are parsed;
+    test_case_results is only recorded as present (empty list).
+
+    Args:
+        report_file: Path to the grading report JSON
+
+    Returns:
+        Report dictionary
+    """
+    if ijson is None:
+        return loads_report(report_file.read_bytes())
+
+    report = {}
+    try:
+        with open(report_file, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                # Top-level values have the key itself as prefix
+                if prefix in _REPORT_FIELDS and event in _SCALAR_EVENTS:
+                    report[prefix] = value
+                elif prefix == 'test_case_results' and event == 'start_array':
+                    report['test_case_results'] = []
+    except ijson.JSONError:
+        # NaN and Infinity in student outputs are not strict JSON
+        return loads_report(report_file.read_bytes())
+    return report
+
+
+def _pr_body_from_event(pr_number: str) -> Optional[str]:
+    """
+    Read a PR body from the GitHub Actions event payload.
+
+    Args:
+        pr_number: Number of the PR being processed
+
+    Returns:
+        PR body, or None if the payload is missing or about another PR
+    """
+    event_path = os.getenv('GITHUB_EVENT_PATH')
+    if not event_path:
+        return None
+
+    try:
+        event = _loads(Path(event_path).read_bytes())
+    except (OSError, ValueError):
+        return None
+
+    pull_request = event.get('pull_request') or {}
+    if str(pull_request.get('number')) != pr_number:
+        return None
+    return pull_request.get('body')
 
 
 def load_assignment_config_from_pr() -> dict:
@@ -47,37 +157,29 @@ def load_assignment_config_from_pr() -> dict:
         return {}
 
     try:
-        from github import Github
-        token = os.getenv('GITHUB_TOKEN')
-        repo_name = os.getenv('GITHUB_REPOSITORY')
+        # On pull_request events the PR body is already in the event payload
+        body = _pr_body_from_event(pr_number)
+
+        if body is None:
+            token = os.getenv('GITHUB_TOKEN')
+            repo_name = os.getenv('GITHUB_REPOSITORY')
 
-        if not token or not repo_name:
-            return {}
+            if not token or not repo_name:
+                return {}
 
-        g = Github(token)
-        repo = g.get_repo(repo_name)
-        pr = repo.get_pull(int(pr_number))
+            pr = _get_repo(token, repo_name).get_pull(int(pr_number))
 
-        # Extract metadata from PR body
-        body = pr.body or ""
+            # Extract metadata from PR body
+            body = pr.body or ""
 
         # Look for metadata comment
-        import re
-        metadata_match = re.search(r'<!-- METADATA\n(.*?)\n-->', body, re.DOTALL)
-        if metadata_match:
-            metadata_text = metadata_match.group(1)
-            config = {}
-            for line in metadata_text.split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    config[key.strip()] = value.strip()
-
-            if 'course_id' in config and 'coursework_id' in config:
-                return {
-                    'course_id': config['course_id'],
-                    'coursework_id': config['coursework_id'],
-                    'max_points': 100  # Default, will be overridden by test results
-                }
+        config = parse_pr_metadata(body)
+        if 'course_id' in config and 'coursework_id' in config:
+            return {
+                'course_id': config['course_id'],
+                'coursework_id': config['coursework_id'],
+                'max_points': 100  # Default, will be overridden by test results
+            }
     except Exception as e:
         print(f"Could not load config from PR: {e}")
 
@@ -117,11 +219,11 @@ def load_assignment_config(assignment_id: str) -> dict:
             }
 
     # Try config file as fallback
-    config_path = Path('courses_config.json')
-    if config_path.exists():
-        with open(config_path) as f:
-            config = json.load(f)
-
+    try:
+        config = _load_courses_config(COURSES_CONFIG_PATH.stat().st_mtime_ns)
+    except FileNotFoundError:
+        config = None
+    if config is not None:
         # Look for assignment in config
         for course in config.get('courses', []):
             for assignment in course.get('assignments', []):
@@ -191,8 +293,7 @@ def send_results(student_id: str, assignment_id: str, report_path: str, submit_g
         print(f"Report file not found: {report_path}")
         return
 
-    with open(report_file) as f:
-        report = json.load(f)
+    report = load_report(report_file)
 
     print(f"\nProcessing results for Student {student_id}, Assignment {assignment_id}")
     print("=" * 60)
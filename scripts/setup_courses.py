@@ -6,8 +6,7 @@ import sys
 import json
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
 
 from src.classroom_client import ClassroomClient
 
@@ -127,15 +126,20 @@ def main():
     print("PREVIEW: Assignments that will be auto-discovered")
     print("=" * 80)
 
+    coursework_lists = client.list_course_work_for_courses(
+        [c['course_id'] for c in config]
+    )
+
     total_assignments = 0
-    for course_config in config:
-        course_id = course_config['course_id']
+    for course_config, (coursework, error) in zip(config, coursework_lists):
         course_name = course_config['name']
 
         print(f"\n{course_name}:")
 
         try:
-            coursework = client.list_course_work(course_id)
+            if error is not None:
+                raise error
+
             published = [w for w in coursework if w.get('state') == 'PUBLISHED']
 
             if published:
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test script for decrypt_submission.py
+
+Encrypts notebooks with EncryptionManager in a temporary directory and checks
+that decrypt_submissions restores them, for default and per-student keys.
+"""
+
+import base64
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import decrypt_submission
+from decrypt_submission import _is_key_material, decrypt_submissions, load_encryption_keys
+from src.encryption import EncryptionManager
+
+STUDENT_ID = "student_at_example_com"
+ASSIGNMENT_ID = "HW1"
+
+# Two files, so decryption goes through the process pool
+NOTEBOOKS = {
+    "solution.ipynb": b'{"cells": [], "nbformat": 4}',
+    "extra.ipynb": b'{"cells": [{"source": "print(1)"}]}',
+}
+
+
+def _whitespace_key(position: int) -> bytes:
+    """32-byte key with a whitespace byte at the start (0) or end (-1)."""
+    key = bytearray(os.urandom(32))
+    key[position] = ord(b' ' if position == 0 else b'\n')
+    return bytes(key)
+
+
+def _encrypt_submission(manager: EncryptionManager):
+    """Write the encrypted notebooks where decrypt_submissions looks for them."""
+    submission_dir = Path("submissions") / STUDENT_ID / ASSIGNMENT_ID
+    for name, content in NOTEBOOKS.items():
+        plain = Path("plain") / name
+        plain.parent.mkdir(exist_ok=True)
+        plain.write_bytes(content)
+        assert manager.encrypt_file(plain, submission_dir / f"{name}.enc", STUDENT_ID)
+
+
+def _decrypt_and_check() -> bool:
+    """Run decrypt_submissions and compare the output with the plaintext."""
+    load_encryption_keys.cache_clear()
+    decrypt_submission._get_worker_manager.cache_clear()
+    try:
+        decrypt_submissions(STUDENT_ID, ASSIGNMENT_ID)
+    except (SystemExit, ValueError):
+        # Exits when a file fails to decrypt; raises on an unusable key
+        return False
+
+    decrypted_dir = Path("decrypted_submissions") / STUDENT_ID / ASSIGNMENT_ID
+    return all(
+        (decrypted_dir / name).read_bytes() == content
+        for name, content in NOTEBOOKS.items()
+    )
+
+
+def _run_in_tempdir(check, *args) -> bool:
+    """Run a check with a fresh working directory and no key variables."""
+    cwd = os.getcwd()
+    saved = {k: os.environ.pop(k, None) for k in ('ENCRYPTION_KEYS', 'DEFAULT_ENCRYPTION_KEY')}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            return check(*args)
+        finally:
+            os.chdir(cwd)
+            for k, v in saved.items():
+                if v is not None:
+                    os.environ[k] = v
+
+
+def _default_key_round_trip(key: bytes) -> bool:
+    keys_dir = Path("student_keys")
+    keys_dir.mkdir()
+    (keys_dir / "default.key").write_bytes(base64.urlsafe_b64encode(key))
+    _encrypt_submission(EncryptionManager(keys_dir, use_default_key=True))
+    return _decrypt_and_check()
+
+
+def _student_key_round_trip(key: bytes, wrap: bool) -> bool:
+    key_file = base64.urlsafe_b64encode(key)
+    _encrypt_submission(EncryptionManager.from_keys({STUDENT_ID: key_file}))
+
+    # export_secrets wraps key files in standard base64; a pasted key is used as-is
+    value = base64.b64encode(key_file) if wrap else key_file
+    os.environ['ENCRYPTION_KEYS'] = json.dumps({STUDENT_ID: value.decode('ascii')})
+    # Per-student keys stay in memory, so no keys directory is created
+    return _decrypt_and_check() and not Path("student_keys").exists()
+
+
+def _urlsafe_key_without_dash_or_underscore() -> bytes:
+    """32-byte key whose urlsafe form has neither '-' nor '_' (about 1 in 4)."""
+    while True:
+        key = os.urandom(32)
+        key_file = base64.urlsafe_b64encode(key)
+        if b'-' not in key_file and b'_' not in key_file:
+            return key
+
+
+def test_is_key_material():
+    """Test telling pasted key files from export_secrets-wrapped ones."""
+    print("Testing ENCRYPTION_KEYS value detection...")
+
+    plain_key = base64.urlsafe_b64encode(_urlsafe_key_without_dash_or_underscore())
+    dashed_key = base64.urlsafe_b64encode(b'\xfb' * 32)  # encodes to '-' only
+    key_24 = base64.urlsafe_b64encode(os.urandom(24))
+
+    test_cases = [
+        ("key file without '-' or '_'", plain_key, True),
+        ("key file with '-'", dashed_key, True),
+        ("wrapped 32-byte key file", base64.b64encode(plain_key), False),
+        ("wrapped 32-byte key file with '-'", base64.b64encode(dashed_key), False),
+        ("wrapped 24-byte key file (44 chars)", base64.b64encode(key_24), False),
+        ("not base64", b'!' * 44, False),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for name, value, expected in test_cases:
+        result = _is_key_material(value.decode('ascii'))
+        if result == expected:
+            print(f"  ✓ {name} -> {result}")
+            passed += 1
+        else:
+            print(f"  ✗ {name} -> Expected {expected}, got {result}")
+            failed += 1
+
+    print(f"\nKey Detection: {passed} passed, {failed} failed\n")
+    return failed == 0
+
+
+def test_round_trip():
+    """Test encrypt -> decrypt_submissions with keys ending in whitespace bytes."""
+    print("Testing decryption round trip...")
+
+    test_cases = [
+        ("default key, leading space", _default_key_round_trip, (_whitespace_key(0),)),
+        ("default key, trailing newline", _default_key_round_trip, (_whitespace_key(-1),)),
+        ("student key, leading space", _student_key_round_trip, (_whitespace_key(0), True)),
+        ("student key, trailing newline", _student_key_round_trip, (_whitespace_key(-1), True)),
+        ("pasted student key without '-' or '_'", _student_key_round_trip,
+         (_urlsafe_key_without_dash_or_underscore(), False)),
+        ("wrapped student key without '-' or '_'", _student_key_round_trip,
+         (_urlsafe_key_without_dash_or_underscore(), True)),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for name, check, args in test_cases:
+        if _run_in_tempdir(check, *args):
+            print(f"  ✓ {name}")
+            passed += 1
+        else:
+            print(f"  ✗ {name}: decrypted files do not match")
+            failed += 1
+
+    print(f"\nDecryption Round Trip: {passed} passed, {failed} failed\n")
+    return failed == 0
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Testing decrypt_submission.py functions")
+    print("=" * 60)
+    print()
+
+    results = []
+    results.append(test_is_key_material())
+    results.append(test_round_trip())
+
+    print("=" * 60)
+    if all(results):
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        print("=" * 60)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
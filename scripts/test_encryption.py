@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for src/encryption.py
+
+Round-trips files through EncryptionManager in a temporary directory, for
+files decrypted in one read and files streamed in chunks.
+"""
+
+import logging
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import _bootstrap  # noqa: F401  (adds repository root to sys.path)
+
+from cryptography.fernet import Fernet
+
+from src.encryption import EncryptionManager
+
+STUDENT_ID = "student_at_example_com"
+
+# Decryption failures are expected below; keep their log lines out of the output
+logging.getLogger('src.encryption').setLevel(logging.CRITICAL)
+
+
+def _round_trip(manager: EncryptionManager, tmp: Path, content: bytes) -> bool:
+    """Encrypt and decrypt content, comparing the result."""
+    plain = tmp / "plain.ipynb"
+    plain.write_bytes(content)
+    encrypted = tmp / "plain.ipynb.enc"
+    decrypted = tmp / "out" / "plain.ipynb"
+    return (manager.encrypt_file(plain, encrypted, STUDENT_ID)
+            and manager.decrypt_file(encrypted, decrypted, STUDENT_ID)
+            and decrypted.read_bytes() == content)
+
+
+def _tampered(manager: EncryptionManager, tmp: Path, content: bytes) -> bool:
+    """Flip a bit of the GCM tag; decryption must fail and write nothing."""
+    plain = tmp / "plain.ipynb"
+    plain.write_bytes(content)
+    encrypted = tmp / "plain.ipynb.enc"
+    manager.encrypt_file(plain, encrypted, STUDENT_ID)
+
+    data = bytearray(encrypted.read_bytes())
+    data[-1] ^= 1
+    encrypted.write_bytes(bytes(data))
+
+    out_dir = tmp / "out"
+    if manager.decrypt_file(encrypted, out_dir / "plain.ipynb", STUDENT_ID):
+        return False
+    return not out_dir.exists() or not any(out_dir.iterdir())
+
+
+def test_round_trip():
+    """Test encryption round trips and failure cases."""
+    print("Testing encryption round trip...")
+
+    small = b'{"cells": [], "nbformat": 4}'
+    large = os.urandom(EncryptionManager.STREAM_CHUNK_SIZE * 2 + 12345)
+    exact = os.urandom(EncryptionManager.STREAM_CHUNK_SIZE - 32)
+
+    def legacy(manager, tmp):
+        key = manager.get_or_create_key(STUDENT_ID)
+        encrypted = tmp / "legacy.enc"
+        encrypted.write_bytes(Fernet(manager._to_fernet_key(key)).encrypt(small))
+        decrypted = tmp / "legacy.ipynb"
+        return (manager.decrypt_file(encrypted, decrypted, STUDENT_ID)
+                and decrypted.read_bytes() == small)
+
+    def other_student(manager, tmp):
+        plain = tmp / "plain.ipynb"
+        plain.write_bytes(small)
+        encrypted = tmp / "plain.ipynb.enc"
+        manager.encrypt_file(plain, encrypted, STUDENT_ID)
+        # Ciphertext is bound to the student through the associated data
+        other = EncryptionManager.from_raw_keys(
+            {"other": manager.get_or_create_key(STUDENT_ID)}, tmp / "keys"
+        )
+        return not other.decrypt_file(encrypted, tmp / "other.ipynb", "other")
+
+    def key_file_mode(manager, tmp):
+        manager.get_or_create_key(STUDENT_ID)
+        key_path = tmp / "keys" / f"{STUDENT_ID}.key"
+        return stat.S_IMODE(key_path.stat().st_mode) == 0o600
+
+    def deterministic(manager, tmp):
+        plain = tmp / "plain.ipynb"
+        plain.write_bytes(small)
+        manager.encrypt_file(plain, tmp / "a.enc", STUDENT_ID)
+        manager.encrypt_file(plain, tmp / "b.enc", STUDENT_ID)
+        return (tmp / "a.enc").read_bytes() == (tmp / "b.enc").read_bytes()
+
+    test_cases = [
+        ("small file (single read)", lambda m, t: _round_trip(m, t, small)),
+        ("empty file", lambda m, t: _round_trip(m, t, b'')),
+        ("file just under the chunk size", lambda m, t: _round_trip(m, t, exact)),
+        ("large file (streamed)", lambda m, t: _round_trip(m, t, large)),
+        ("tampered small file leaves no output", lambda m, t: _tampered(m, t, small)),
+        ("tampered large file leaves no output", lambda m, t: _tampered(m, t, large)),
+        ("legacy Fernet ciphertext", legacy),
+        ("other student cannot decrypt", other_student),
+        ("key file is owner-only", key_file_mode),
+        ("ciphertext is deterministic", deterministic),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for name, check in test_cases:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            manager = EncryptionManager(tmp / "keys")
+            if check(manager, tmp):
+                print(f"  ✓ {name}")
+                passed += 1
+            else:
+                print(f"  ✗ {name}")
+                failed += 1
+
+    print(f"\nEncryption Round Trip: {passed} passed, {failed} failed\n")
+    return failed == 0
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Testing src/encryption.py")
+    print("=" * 60)
+    print()
+
+    results = []
+    results.append(test_round_trip())
+
+    print("=" * 60)
+    if all(results):
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        print("=" * 60)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
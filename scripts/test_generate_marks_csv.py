@@ -6,16 +6,81 @@ This script allows testing the CSV generation locally before merging the workflo
 It creates mock PR data to verify the logic works correctly.
 """
 
+import json
 import sys
+import tempfile
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from github import GithubException
+
 # Import the functions we want to test
+import generate_marks_csv
 from generate_marks_csv import parse_pr_title, extract_score_from_comment, get_student_email_from_id
 
 
+class FakePages(list):
+    """Stand-in for a PyGithub PaginatedList."""
+
+    @property
+    def totalCount(self):
+        return len(self)
+
+    def get_page(self, page):
+        size = generate_marks_csv.GITHUB_PAGE_SIZE
+        return FakePages(self[page * size:(page + 1) * size])
+
+
+class FakeComment:
+    def __init__(self, body):
+        self.body = body
+
+
+class FakeIssue:
+    """Submission PR as listed by get_issues; counts its comment requests."""
+
+    pull_request = True
+
+    def __init__(self, number, title, day, comments, fail=False):
+        self.number = number
+        self.title = title
+        self.updated_at = datetime(2024, 1, day, tzinfo=timezone.utc)
+        self.bodies = comments
+        self.comments = len(comments)
+        self.fail = fail
+        self.fetches = 0
+
+    def get_comments(self):
+        self.fetches += 1
+        if self.fail:
+            raise GithubException(500, None, None)
+        return FakePages(FakeComment(body) for body in self.bodies)
+
+
+def _fake_github(issues):
+    """Github class whose repository lists the given issues."""
+    class FakeRepo:
+        def get_pulls(self, state='all'):
+            return FakePages(issues)
+
+        def get_issues(self, state='all'):
+            return FakePages(issues)
+
+    class FakeGithub:
+        rate_limiting_resettime = 0
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def get_repo(self, name):
+            return FakeRepo()
+
+    return FakeGithub
+
+
 def test_get_student_email_from_id():
     """Test student ID to email conversion."""
     print("Testing student ID to email conversion...")
@@ -89,6 +154,8 @@ def test_extract_score_from_comment():
         ("Your grade for this assignment: 75%", 75.0),
         ("## 🤖 Grading Results\n\nScore: 90/100 (90.00%)", 90.0),
         ("No score here", None),
+        ("Looks good, merging 100%", None),
+        ("Earned points: 8 of total points: 10", 80.0),
     ]
     
     passed = 0
@@ -107,6 +174,164 @@ def test_extract_score_from_comment():
     return failed == 0
 
 
+def test_score_cache():
+    """Test the SQLite score cache with the REST fetcher."""
+    print("Testing score cache...")
+
+    graded = FakeIssue(1, "Submission: a_at_x_com - HW1", 1, ["Score: 8/10"])
+    broken = FakeIssue(2, "Submission: b_at_x_com - HW1", 1, ["Score: 5/10"], fail=True)
+    original_github = generate_marks_csv.Github
+    generate_marks_csv.Github = _fake_github([graded, broken])
+
+    def run(cache_path):
+        cache = generate_marks_csv.load_score_cache(cache_path, 'o/r')
+        _, scored = generate_marks_csv.fetch_pr_scores_rest('o/r', 't', cache)
+        generate_marks_csv.save_score_cache(cache_path, 'o/r', cache)
+        return dict(scored)
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / 'cache.sqlite'
+
+            scores = run(cache_path)
+            results.append(("first run fetches every PR",
+                            graded.fetches == 1 and broken.fetches == 1
+                            and scores[('a_at_x_com', 'HW1')] == 80.0))
+
+            scores = run(cache_path)
+            results.append(("unchanged PR is a cache hit",
+                            graded.fetches == 1 and scores[('a_at_x_com', 'HW1')] == 80.0))
+            results.append(("failed PR is not cached", broken.fetches == 2))
+
+            graded.updated_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+            graded.bodies = ["Score: 9/10"]
+            scores = run(cache_path)
+            results.append(("changed updated_at is a cache miss",
+                            graded.fetches == 2 and scores[('a_at_x_com', 'HW1')] == 90.0))
+    finally:
+        generate_marks_csv.Github = original_github
+
+    passed = 0
+    failed = 0
+
+    for name, ok in results:
+        if ok:
+            print(f"  ✓ {name}")
+            passed += 1
+        else:
+            print(f"  ✗ {name}")
+            failed += 1
+
+    print(f"\nScore Cache: {passed} passed, {failed} failed\n")
+    return failed == 0
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.content = json.dumps({'data': data}).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeGraphQLSession:
+    """
+    Answers the PR listing and PR comments queries from in-memory PRs.
+
+    PR pages hold 2 PRs (instead of 100) and the listing returns the last 10
+    comments of each PR; cursors are list indexes.
+    """
+
+    def __init__(self, prs):
+        self.prs = prs  # [(number, title, updatedAt, [comment bodies])]
+        self.requests = []
+
+    @staticmethod
+    def _comments(bodies, end, count):
+        start = max(0, end - count)
+        return {
+            'pageInfo': {'startCursor': str(start), 'hasPreviousPage': start > 0},
+            'nodes': [{'body': body} for body in bodies[start:end]],
+        }
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        variables = json['variables']
+        self.requests.append(variables)
+        if 'number' in variables:
+            bodies = next(p[3] for p in self.prs if p[0] == variables['number'])
+            comments = self._comments(bodies, int(variables['cursor']), 100)
+            return FakeResponse({'repository': {'pullRequest': {'comments': comments}}})
+
+        start = int(variables['cursor'] or 0)
+        page = self.prs[start:start + 2]
+        return FakeResponse({'repository': {'pullRequests': {
+            'totalCount': len(self.prs),
+            'pageInfo': {'endCursor': str(start + 2), 'hasNextPage': start + 2 < len(self.prs)},
+            'nodes': [
+                {'number': number, 'title': title, 'updatedAt': updated_at,
+                 'comments': self._comments(bodies, len(bodies), 10)}
+                for number, title, updated_at, bodies in page
+            ],
+        }}})
+
+
+def test_fetch_pr_scores_graphql():
+    """Test GraphQL PR pagination and backward comment paging."""
+    print("Testing GraphQL fetcher...")
+
+    session = FakeGraphQLSession([
+        (1, "Submission: a_at_x_com - HW1", "2024-01-01T00:00:00Z", ["Score: 8/10"]),
+        (2, "Fix typo", "2024-01-01T00:00:00Z", ["Score: 1/1"]),
+        # Score only in the oldest comment: needs one comments request
+        (3, "Submission: b_at_x_com - HW1", "2024-01-01T00:00:00Z",
+         ["Score: 7/10"] + ["thanks"] * 150),
+        (4, "Submission: a_at_x_com - HW2", "2024-01-01T00:00:00Z", ["no score"] * 12),
+        (5, "Submission: c_at_x_com - HW1", "2024-01-01T00:00:00Z", []),
+    ])
+    original_session = generate_marks_csv._SESSION
+    generate_marks_csv._SESSION = session
+    try:
+        total_prs, scored = generate_marks_csv.fetch_pr_scores_graphql('o/r', 't')
+        # PR 3 pages back twice (100, then the oldest 41 comments), PR 4 once
+        comment_pages = [r['number'] for r in session.requests if 'number' in r]
+        session.requests.clear()
+        _, cached = generate_marks_csv.fetch_pr_scores_graphql('o/r', 't', dict(
+            (number, (updated_at, None)) for number, _, updated_at, _ in session.prs
+        ))
+    finally:
+        generate_marks_csv._SESSION = original_session
+
+    listing = [r for r in session.requests if 'number' not in r]
+    test_cases = [
+        ("total PR count", total_prs, 5),
+        ("scores of submission PRs", scored, [
+            (('a_at_x_com', 'HW1'), 80.0),
+            (('b_at_x_com', 'HW1'), 70.0),
+            (('a_at_x_com', 'HW2'), None),
+            (('c_at_x_com', 'HW1'), None),
+        ]),
+        ("older comments fetched only without a score", comment_pages, [3, 3, 4]),
+        ("cached PRs need only the 3 listing pages",
+         (len(listing), len(session.requests), [s for _, s in cached]),
+         (3, 3, [None] * 4)),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for name, result, expected in test_cases:
+        if result == expected:
+            print(f"  ✓ {name}")
+            passed += 1
+        else:
+            print(f"  ✗ {name} -> Expected {expected}, got {result}")
+            failed += 1
+
+    print(f"\nGraphQL Fetcher: {passed} passed, {failed} failed\n")
+    return failed == 0
+
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -118,6 +343,8 @@ def main():
     results.append(test_get_student_email_from_id())
     results.append(test_parse_pr_title())
     results.append(test_extract_score_from_comment())
+    results.append(test_score_cache())
+    results.append(test_fetch_pr_scores_graphql())
     
     print("=" * 60)
     if all(results):
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for reencrypt_and_push.py
+
+Re-encrypts notebooks in a temporary directory through the process pool and
+checks that the stored default key decrypts every one of them.
+"""
+
+import base64
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import reencrypt_and_push
+from src.encryption import EncryptionManager
+
+NOTEBOOKS = {
+    ("alice_at_example_com", "HW1", "solution.ipynb"): b'{"cells": [], "nbformat": 4}',
+    ("alice_at_example_com", "HW2", "solution.ipynb"): b'{"cells": [{"source": "1"}]}',
+    ("bob_at_example_com", "HW1", "answers.ipynb"): b'{"cells": [{"source": "2"}]}',
+}
+
+
+def _round_trip(key: bytes) -> bool:
+    """Re-encrypt with a stored default key, then decrypt with that key."""
+    keys_dir = Path("student_keys")
+    keys_dir.mkdir()
+    (keys_dir / "default.key").write_bytes(base64.urlsafe_b64encode(key))
+
+    for (student_id, assignment, name), content in NOTEBOOKS.items():
+        notebook = Path("submissions") / student_id / assignment / name
+        notebook.parent.mkdir(parents=True, exist_ok=True)
+        notebook.write_bytes(content)
+
+    reencrypt_and_push._get_worker_manager.cache_clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        reencrypt_and_push.main()
+
+    manager = EncryptionManager(keys_dir, use_default_key=True)
+    for (student_id, assignment, name), content in NOTEBOOKS.items():
+        encrypted = Path("submissions") / student_id / assignment / f"{name}.enc"
+        decrypted = Path("decrypted") / student_id / assignment / name
+        if not manager.decrypt_file(encrypted, decrypted, student_id):
+            return False
+        if decrypted.read_bytes() != content:
+            return False
+    return True
+
+
+def test_round_trip():
+    """Test re-encryption with default keys ending in whitespace bytes."""
+    print("Testing re-encryption round trip...")
+
+    plain_key = bytearray(os.urandom(32))
+    leading_space = bytearray(os.urandom(32))
+    leading_space[0] = ord(' ')
+    trailing_newline = bytearray(os.urandom(32))
+    trailing_newline[-1] = ord('\n')
+
+    test_cases = [
+        ("random key", bytes(plain_key)),
+        ("key with leading space", bytes(leading_space)),
+        ("key with trailing newline", bytes(trailing_newline)),
+    ]
+
+    passed = 0
+    failed = 0
+    saved = os.environ.pop('DEFAULT_ENCRYPTION_KEY', None)
+    cwd = os.getcwd()
+
+    try:
+        for name, key in test_cases:
+            with tempfile.TemporaryDirectory() as tmp:
+                os.chdir(tmp)
+                try:
+                    ok = _round_trip(key)
+                finally:
+                    os.chdir(cwd)
+            if ok:
+                print(f"  ✓ {name}")
+                passed += 1
+            else:
+                print(f"  ✗ {name}: stored key does not decrypt the notebooks")
+                failed += 1
+    finally:
+        if saved is not None:
+            os.environ['DEFAULT_ENCRYPTION_KEY'] = saved
+
+    print(f"\nRe-encryption Round Trip: {passed} passed, {failed} failed\n")
+    return failed == 0
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Testing reencrypt_and_push.py")
+    print("=" * 60)
+    print()
+
+    results = []
+    results.append(test_round_trip())
+
+    print("=" * 60)
+    if all(results):
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        print("=" * 60)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Test script for send_results.py
+
+Tests PR metadata parsing and report loading, with and without ijson.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import send_results
+from send_results import parse_pr_metadata, load_report
+from src.report_json import dumps_report, loads_report
+
+REPORTS = [
+    (
+        "test case report",
+        {
+            "score": 75.0, "earned_points": 7.5, "total_points": 10,
+            "passed_cases": 3, "total_test_cases": 4,
+            # Nested fields with report field names must not leak to the top level
+            "test_case_results": [{"score": 0, "error": "wrong answer"}],
+            "student_outputs": {"cell_1": {"matches": 99}},
+        },
+        {
+            "score": 75.0, "earned_points": 7.5, "total_points": 10,
+            "passed_cases": 3, "total_test_cases": 4, "has_test_cases": True,
+        },
+    ),
+    (
+        "output matching report",
+        {"score": 50.0, "matches": 1, "total_expected": 2, "student_outputs": ["a", "b"]},
+        {"score": 50.0, "matches": 1, "total_expected": 2, "has_test_cases": False},
+    ),
+    (
+        "report with NaN and Infinity in student outputs",
+        {
+            "score": 100.0, "matches": 2, "total_expected": 2,
+            "student_outputs": [float("nan"), {"value": float("inf")}],
+        },
+        {"score": 100.0, "matches": 2, "total_expected": 2, "has_test_cases": False},
+    ),
+    (
+        "report with NaN and an integer wider than 64 bits",
+        {
+            "score": 50.0, "earned_points": 5, "total_points": 10,
+            "passed_cases": 1, "total_test_cases": 2,
+            "test_case_results": [{"received": [2 ** 70, float("-inf")]}],
+        },
+        {
+            "score": 50.0, "earned_points": 5, "total_points": 10,
+            "passed_cases": 1, "total_test_cases": 2, "has_test_cases": True,
+        },
+    ),
+    (
+        "error report",
+        {"error": "Notebook failed to execute", "score": 0},
+        {"error": "Notebook failed to execute", "score": 0, "has_test_cases": False},
+    ),
+]
+
+
+def _report_summary(report: dict) -> dict:
+    """The parts of a report that send_results uses."""
+    summary = {k: report[k] for k in send_results._REPORT_FIELDS if k in report}
+    summary['has_test_cases'] = 'test_case_results' in report
+    return summary
+
+
+def test_parse_pr_metadata():
+    """Test parsing the metadata block of a PR body."""
+    print("Testing parse_pr_metadata...")
+
+    test_cases = [
+        ("no metadata block", "Submission for HW1", {}),
+        ("empty body", "", {}),
+        (
+            "metadata block",
+            "Submission\n<!-- METADATA\nassignment: HW1\nstudent_id: alice_at_example_com\n-->\n",
+            {"assignment": "HW1", "student_id": "alice_at_example_com"},
+        ),
+        (
+            "value containing a colon",
+            "<!-- METADATA\nsubmitted_at: 2024-01-01T10:00:00\n-->",
+            {"submitted_at": "2024-01-01T10:00:00"},
+        ),
+        (
+            "unterminated block",
+            "<!-- METADATA\nassignment: HW1\n",
+            {},
+        ),
+        (
+            "only the first block is read",
+            "<!-- METADATA\nassignment: HW1\n-->\n<!-- METADATA\nassignment: HW2\n-->",
+            {"assignment": "HW1"},
+        ),
+        (
+            "lines without a colon are skipped",
+            "<!-- METADATA\nassignment: HW1\njust text\n\nnote:\n-->",
+            {"assignment": "HW1", "note": ""},
+        ),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for name, body, expected in test_cases:
+        result = parse_pr_metadata(body)
+        if result == expected:
+            print(f"  ✓ {name}")
+            passed += 1
+        else:
+            print(f"  ✗ {name}: Expected {expected}, got {result}")
+            failed += 1
+
+    print(f"\nMetadata Parsing: {passed} passed, {failed} failed\n")
+    return failed == 0
+
+
+def test_report_outputs_round_trip():
+    """Test that student outputs survive writing and reading a report."""
+    print("Testing report output round trip...")
+
+    passed = 0
+    failed = 0
+
+    for name, report, _ in REPORTS:
+        outputs = report.get("student_outputs", report.get("test_case_results"))
+        result = loads_report(dumps_report(report))
+        result = result.get("student_outputs", result.get("test_case_results"))
+        # NaN != NaN, so compare the encodings instead
+        if repr(result) == repr(outputs):
+            print(f"  ✓ {name}")
+            passed += 1
+        else:
+            print(f"  ✗ {name}: Expected {outputs!r}, got {result!r}")
+            failed += 1
+
+    print(f"\nReport Round Trip: {passed} passed, {failed} failed\n")
+    return failed == 0
+
+
+def _check_load_report(label: str) -> bool:
+    """Load each report in REPORTS and compare the fields send_results uses."""
+    passed = 0
+    failed = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, report, expected in REPORTS:
+            report_file = Path(tmp) / "report.json"
+            report_file.write_bytes(dumps_report(report))
+            result = _report_summary(load_report(report_file))
+            if result == expected:
+                print(f"  ✓ {name}")
+                passed += 1
+            else:
+                print(f"  ✗ {name}: Expected {expected}, got {result}")
+                failed += 1
+
+    print(f"\nReport Loading ({label}): {passed} passed, {failed} failed\n")
+    return failed == 0
+
+
+def test_load_report_ijson():
+    """Test loading report summary fields incrementally with ijson."""
+    print("Testing load_report with ijson...")
+
+    if send_results.ijson is None:
+        print("  - skipped: ijson is not installed\n")
+        return True
+    return _check_load_report("ijson")
+
+
+def test_load_report_without_ijson():
+    """Test loading the whole report when ijson is not installed."""
+    print("Testing load_report without ijson...")
+
+    saved = send_results.ijson
+    send_results.ijson = None
+    try:
+        return _check_load_report("without ijson")
+    finally:
+        send_results.ijson = saved
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Testing send_results.py functions")
+    print("=" * 60)
+    print()
+
+    results = []
+    results.append(test_parse_pr_metadata())
+    results.append(test_report_outputs_round_trip())
+    results.append(test_load_report_ijson())
+    results.append(test_load_report_without_ijson())
+
+    print("=" * 60)
+    if all(results):
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        print("=" * 60)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
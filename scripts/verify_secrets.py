@@ -18,8 +18,7 @@ def verify_credentials():
         return False
 
     try:
-        with open(credentials_path) as f:
-            data = json.load(f)
+        data = json.loads(credentials_path.read_bytes())
 
         if "installed" in data or "web" in data:
             print(f"   ✓ Valid JSON ({len(json.dumps(data))} characters)")
@@ -44,8 +43,7 @@ def verify_token():
 
     try:
         # Read binary file
-        with open(token_path, 'rb') as f:
-            original = f.read()
+        original = token_path.read_bytes()
 
         # Encode to base64
         encoded = base64.b64encode(original).decode('utf-8')
@@ -117,8 +115,7 @@ def verify_assignments_config():
         return True
 
     try:
-        with open(config_path) as f:
-            data = json.load(f)
+        data = json.loads(config_path.read_bytes())
 
         if not isinstance(data, list):
             print("   ✗ Should be a JSON array")
@@ -3,8 +3,12 @@ Google Classroom API client for downloading student submissions.
 """
 import os
 import pickle
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
+import google_auth_httplib2
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -42,6 +46,8 @@ class ClassroomClient:
         self.token_path = token_path
         self.service = None
         self.drive_service = None
+        self._credentials = None
+        self._local = threading.local()
         self._authenticate()
 
     def _authenticate(self):
@@ -102,10 +108,24 @@ class ClassroomClient:
             with open(self.token_path, 'wb') as token:
                 pickle.dump(creds, token)
 
+        self._credentials = creds
         self.service = build('classroom', 'v1', credentials=creds)
         self.drive_service = build('drive', 'v3', credentials=creds)
         logger.info("Successfully authenticated with Google Classroom API")
 
+    def _http(self):
+        """
+        Get an authorized HTTP object for the current thread.
+
+        httplib2 connections are not thread-safe, so requests issued from
+        worker threads must each use their own HTTP object.
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._local.http = http
+        return http
+
     def list_courses(self) -> List[Dict]:
         """List all courses accessible to the authenticated user."""
         results = self.service.courses().list(pageSize=100).execute()
@@ -124,10 +144,33 @@ class ClassroomClient:
         """
         results = self.service.courses().courseWork().list(
             courseId=course_id
-        ).execute()
+        ).execute(http=self._http())
         coursework = results.get('courseWork', [])
         return coursework
 
+    def list_course_work_for_courses(
+        self, course_ids: List[str], max_workers: int = 8
+    ) -> List[Tuple[Optional[List[Dict]], Optional[Exception]]]:
+        """
+        List coursework for several courses concurrently.
+
+        Args:
+            course_ids: IDs of the courses
+            max_workers: Maximum number of concurrent requests
+
+        Returns:
+            (coursework, error) for each course, in the order of course_ids;
+            a course that fails does not stop the others
+        """
+        def fetch(course_id: str):
+            try:
+                return (self.list_course_work(course_id), None)
+            except Exception as e:
+                return (None, e)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, course_ids))
+
     def list_students(self, course_id: str) -> List[Dict]:
         """
         List all students enrolled in a given course.
@@ -184,6 +227,34 @@ class ClassroomClient:
 
         return submissions
 
+    def index_submissions(self, course_id: str, coursework_id: str) -> Dict[str, str]:
+        """
+        Map student emails to submission IDs for a specific assignment.
+
+        Uses one roster listing and one submissions listing instead of a
+        profile lookup per submission, so it is suited to bulk operations.
+
+        Args:
+            course_id: The ID of the course
+            coursework_id: The ID of the coursework/assignment
+
+        Returns:
+            Dictionary mapping lowercase student email to submission ID
+        """
+        emails_by_user = {}
+        for student in self.list_students(course_id):
+            email = student.get('profile', {}).get('emailAddress', '')
+            if email:
+                emails_by_user[student.get('userId')] = email.lower()
+
+        index = {}
+        for submission in self.get_submissions(course_id, coursework_id):
+            email = emails_by_user.get(submission.get('userId'))
+            if email:
+                index[email] = submission.get('id')
+
+        return index
+
     def download_attachment(self, attachment: Dict, output_dir: Path) -> Optional[Path]:
         """
         Download a submission attachment.
@@ -315,7 +386,7 @@ class ClassroomClient:
                 id=submission_id,
                 updateMask='draftGrade',
                 body=body
-            ).execute()
+            ).execute(http=self._http())
 
             logger.info(
                 f"Submitted draft grade {grade} for submission {submission_id} "
@@ -345,16 +416,12 @@ class ClassroomClient:
             Submission ID if found, None otherwise
         """
         try:
-            submissions = self.get_submissions(course_id, coursework_id)
-
-            for submission in submissions:
-                user_id = submission.get('userId')
-                student_info = self.get_student_info(course_id, user_id)
-                profile = student_info.get('profile', {})
-                email = profile.get('emailAddress', '')
-
-                if email.lower() == student_email.lower():
-                    return submission.get('id')
+            # Two listings instead of a profile lookup per submission
+            submission_id = self.index_submissions(course_id, coursework_id).get(
+                student_email.lower()
+            )
+            if submission_id:
+                return submission_id
 
             logger.warning(
                 f"No submission found for student {student_email} "
@@ -3,10 +3,12 @@ import os
 import base64
 import binascii
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional, Union
 
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import logging
 import json
@@ -19,6 +21,8 @@ class EncryptionManager:
 
     VERSION_PREFIX = b"HWG2"
     NONCE_SIZE = 12
+    TAG_SIZE = 16
+    STREAM_CHUNK_SIZE = 1 << 20
 
     def __init__(self, keys_dir: Path = Path("student_keys"), use_default_key: bool = False):
         """
@@ -29,11 +33,49 @@ class EncryptionManager:
             use_default_key: If True, use a single default key for all students
         """
         self.keys_dir = Path(keys_dir)
-        self.keys_dir.mkdir(exist_ok=True)
         self._keys_cache: Dict[str, bytes] = {}
+        self._aesgcm_cache: Dict[bytes, AESGCM] = {}
+        self._fernet_cache: Dict[bytes, Fernet] = {}
         self.use_default_key = use_default_key
         self._default_key: Optional[bytes] = None
 
+    @classmethod
+    def from_keys(cls, keys: Dict[str, Union[bytes, str]],
+                  keys_dir: Path = Path("student_keys")) -> "EncryptionManager":
+        """
+        Create a manager from in-memory key material.
+
+        Args:
+            keys: Mapping of student ID to key material, in the same format
+                  as the contents of a student's .key file
+            keys_dir: Directory used for any key that is not in ``keys``
+
+        Returns:
+            EncryptionManager that never reads or writes the given keys on disk
+        """
+        return cls.from_raw_keys(
+            {student_id: cls._decode_key_material(raw_key) for student_id, raw_key in keys.items()},
+            keys_dir
+        )
+
+    @classmethod
+    def from_raw_keys(cls, keys: Dict[str, bytes],
+                      keys_dir: Path = Path("student_keys")) -> "EncryptionManager":
+        """
+        Create a manager from already decoded key bytes.
+
+        Args:
+            keys: Mapping of student ID to raw key bytes, as returned by
+                  get_or_create_key (used as-is, never decoded again)
+            keys_dir: Directory used for any key that is not in ``keys``
+
+        Returns:
+            EncryptionManager that never reads or writes the given keys on disk
+        """
+        manager = cls(keys_dir, use_default_key=False)
+        manager._keys_cache.update(keys)
+        return manager
+
     # ------------------------------------------------------------------
     # Key management helpers
     # ------------------------------------------------------------------
@@ -81,7 +123,14 @@ class EncryptionManager:
         return self._decode_key_material(raw)
 
     def _store_key_to_file(self, key_path: Path, key_bytes: bytes):
-        key_path.write_bytes(self._encode_key_material(key_bytes))
+        # The keys directory is only created once a key is written to it
+        key_path.parent.mkdir(mode=0o700, exist_ok=True)
+        # Key files are created owner-only (0o600)
+        fd = os.open(key_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, self._encode_key_material(key_bytes))
+        finally:
+            os.close(fd)
 
     def _get_or_create_default_key(self) -> bytes:
         """Get or create the default encryption key."""
@@ -167,6 +216,20 @@ class EncryptionManager:
         """Convert raw key bytes to a Fernet-compatible base64 key."""
         return base64.urlsafe_b64encode(key_bytes)
 
+    def _get_aesgcm(self, key: bytes) -> AESGCM:
+        """Get a cached AES-GCM cipher for the given key."""
+        aesgcm = self._aesgcm_cache.get(key)
+        if aesgcm is None:
+            aesgcm = self._aesgcm_cache[key] = AESGCM(key)
+        return aesgcm
+
+    def _get_fernet(self, key: bytes) -> Fernet:
+        """Get a cached Fernet instance for the given key."""
+        fernet = self._fernet_cache.get(key)
+        if fernet is None:
+            fernet = self._fernet_cache[key] = Fernet(self._to_fernet_key(key))
+        return fernet
+
     def encrypt_file(self, input_path: Path, output_path: Path, student_id: str) -> bool:
         """Encrypt a file deterministically for a specific student."""
         try:
@@ -179,7 +242,7 @@ class EncryptionManager:
                 digest_size=self.NONCE_SIZE
             ).digest()
 
-            aesgcm = AESGCM(key)
+            aesgcm = self._get_aesgcm(key)
             ciphertext = aesgcm.encrypt(nonce, plaintext, self._associated_data(student_id))
             payload = self.VERSION_PREFIX + nonce + ciphertext
 
@@ -198,40 +261,97 @@ class EncryptionManager:
             logger.error(f"Encryption failed for {input_path}: {e}")
             return False
 
-    def _decrypt_new_format(self, data: bytes, key: bytes, student_id: str) -> bytes:
-        if not data.startswith(self.VERSION_PREFIX):
-            raise ValueError("Unsupported ciphertext format")
-
-        header_len = len(self.VERSION_PREFIX)
-        if len(data) <= header_len + self.NONCE_SIZE:
-            raise ValueError("Ciphertext truncated")
+    def _decrypt_new_format_to_file(self, input_path: Path, output_path: Path,
+                                    key: bytes, student_id: str):
+        """
+        Stream-decrypt a new-format file to output_path in fixed-size chunks.
 
-        nonce = data[header_len:header_len + self.NONCE_SIZE]
-        ciphertext = data[header_len + self.NONCE_SIZE:]
+        Files up to STREAM_CHUNK_SIZE are decrypted in memory with a single
+        read. Larger plaintext is written to a temporary file and only moved
+        into place once the GCM tag has been verified, so a tampered file
+        never leaves partial output behind.
+        """
+        header_len = len(self.VERSION_PREFIX) + self.NONCE_SIZE
+
+        with open(input_path, 'rb') as src:
+            file_size = os.fstat(src.fileno()).st_size
+
+            # Small files: one read and one write, no seeks or temp file
+            if file_size <= self.STREAM_CHUNK_SIZE:
+                data = src.read()
+                if not data.startswith(self.VERSION_PREFIX):
+                    raise ValueError("Unsupported ciphertext format")
+                nonce = data[len(self.VERSION_PREFIX):header_len]
+                plaintext = self._get_aesgcm(key).decrypt(
+                    nonce, data[header_len:], self._associated_data(student_id)
+                )
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.write_bytes(plaintext)
+                return
+
+            # Large files are read front to back; let the kernel read ahead
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(src.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            header = src.read(header_len)
+            if not header.startswith(self.VERSION_PREFIX):
+                raise ValueError("Unsupported ciphertext format")
+
+            ciphertext_len = file_size - header_len - self.TAG_SIZE
+            if len(header) < header_len or ciphertext_len < 0:
+                raise ValueError("Ciphertext truncated")
+
+            nonce = header[len(self.VERSION_PREFIX):]
+            src.seek(-self.TAG_SIZE, os.SEEK_END)
+            tag = src.read(self.TAG_SIZE)
+            src.seek(header_len)
+
+            decryptor = Cipher(algorithms.AES(key), modes.GCM(nonce, tag)).decryptor()
+            decryptor.authenticate_additional_data(self._associated_data(student_id))
 
-        aesgcm = AESGCM(key)
-        return aesgcm.decrypt(nonce, ciphertext, self._associated_data(student_id))
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = output_path.with_name(output_path.name + '.part')
+            try:
+                # Read the next chunk in the background while the current
+                # one is decrypted and written (file I/O releases the GIL)
+                with open(tmp_path, 'wb') as out, \
+                        ThreadPoolExecutor(max_workers=1) as reader:
+                    remaining = ciphertext_len
+                    pending = reader.submit(src.read, min(self.STREAM_CHUNK_SIZE, remaining))
+                    while remaining:
+                        chunk = pending.result()
+                        if not chunk:
+                            raise ValueError("Ciphertext truncated")
+                        remaining -= len(chunk)
+                        if remaining:
+                            pending = reader.submit(
+                                src.read, min(self.STREAM_CHUNK_SIZE, remaining)
+                            )
+                        out.write(decryptor.update(chunk))
+                    out.write(decryptor.finalize())
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+        os.replace(tmp_path, output_path)
 
     def _decrypt_legacy(self, data: bytes, key: bytes) -> bytes:
         # Legacy Fernet ciphertext support
-        fernet_key = self._to_fernet_key(key)
-        fernet = Fernet(fernet_key)
+        fernet = self._get_fernet(key)
         return fernet.decrypt(data)
 
     def decrypt_file(self, input_path: Path, output_path: Path, student_id: str) -> bool:
         """Decrypt a file for a specific student (supports legacy format)."""
         try:
             key = self.get_or_create_key(student_id)
-            encrypted = input_path.read_bytes()
 
             try:
-                plaintext = self._decrypt_new_format(encrypted, key, student_id)
+                self._decrypt_new_format_to_file(input_path, output_path, key, student_id)
             except Exception:
                 # Fallback to legacy Fernet ciphertexts
-                plaintext = self._decrypt_legacy(encrypted, key)
-
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_bytes(plaintext)
+                plaintext = self._decrypt_legacy(input_path.read_bytes(), key)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.write_bytes(plaintext)
 
             logger.info(f"Decrypted {input_path.name} for student {student_id}")
             return True
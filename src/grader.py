@@ -2,12 +2,15 @@
 import json
 import logging
 import os
+import tempfile
+import uuid
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 import nbformat
 from nbconvert.preprocessors import ExecutePreprocessor
-from jupyter_client.kernelspec import NoSuchKernel
+from jupyter_client.kernelspec import KernelSpecManager, NoSuchKernel
+from traitlets.config import Config
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +32,31 @@ class NotebookGrader:
     def _create_executor(self) -> ExecutePreprocessor:
         """Create an ExecutePreprocessor, installing the kernel if missing."""
         try:
-            return ExecutePreprocessor(timeout=self.timeout, kernel_name=self.kernel_name)
+            KernelSpecManager().get_kernel_spec(self.kernel_name)
         except NoSuchKernel:
             logger.warning(
                 "Kernel '%s' not found. Attempting to install ipykernel...",
                 self.kernel_name,
             )
             self._install_kernel_spec()
-            return ExecutePreprocessor(timeout=self.timeout, kernel_name=self.kernel_name)
+        return ExecutePreprocessor(
+            timeout=self.timeout, kernel_name=self.kernel_name, config=self._kernel_config()
+        )
+
+    @staticmethod
+    def _kernel_config() -> Config:
+        """
+        Kernel manager config using Unix sockets where available.
+
+        TCP ports are picked by binding and releasing them, so kernels started
+        at once by separate worker processes can pick the same port. Socket
+        paths get a unique absolute prefix, as the kernel runs in the
+        notebook's directory.
+        """
+        if os.name != 'posix':
+            return Config()
+        ip = os.path.join(tempfile.gettempdir(), f"kernel-{uuid.uuid4().hex}-ipc")
+        return Config({'KernelManager': {'transport': 'ipc', 'ip': ip}})
 
     def _install_kernel_spec(self):
         """Install the default ipykernel so notebooks can execute."""
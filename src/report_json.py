@@ -0,0 +1,64 @@
+"""
+JSON encoding of grading reports.
+
+Student outputs are parsed with json.loads, so a report can hold NaN or
+Infinity. Reports keep the json module's encoding of these (bare NaN and
+Infinity tokens); orjson is used only where it gives the same result.
+"""
+import json
+import math
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _has_non_finite(obj) -> bool:
+    """Whether obj contains a NaN or infinite float."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+    return False
+
+
+def dumps_report(report) -> bytes:
+    """
+    Encode a grading report as indented JSON.
+
+    Args:
+        report: Grading result dictionary
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    # orjson writes NaN and Infinity as null, which would change the outputs
+    if orjson is not None and not _has_non_finite(report):
+        try:
+            return orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers wider than 64 bits in student outputs
+            pass
+    return json.dumps(report, indent=2).encode()
+
+
+def loads_report(data: bytes):
+    """
+    Decode a grading report written by dumps_report.
+
+    Args:
+        data: Report file contents
+
+    Returns:
+        Report dictionary
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN and Infinity tokens are not strict JSON
+            pass
+    return json.loads(data)
@@ -0,0 +1,29 @@
+"""
+Conversion of student IDs back to email addresses.
+"""
+
+
+def get_student_email_from_id(student_id: str) -> str:
+    """
+    Convert student_id back to email format.
+
+    Args:
+        student_id: Student identifier (email with @ and . replaced)
+
+    Returns:
+        Student email address
+
+    Note:
+        This conversion has a limitation: it cannot distinguish between
+        underscores that were originally dots and underscores that were
+        already in the email. For example:
+        - 'test_user@example.com' becomes 'test_user_at_example_com' (encoded)
+        - Then converts back to 'test.user@example.com' (incorrect)
+
+        To avoid issues, student emails should not contain underscores.
+    """
+    # Reverse the transformation done in classroom_client.py:
+    # email.replace('@', '_at_').replace('.', '_')
+    email = student_id.replace('_at_', '@')
+    email = email.replace('_', '.')
+    return email
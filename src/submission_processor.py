@@ -3,6 +3,7 @@ Main submission processor that orchestrates the entire workflow.
 """
 import os
 import logging
+import re
 from pathlib import Path
 from typing import List, Dict
 from datetime import datetime
@@ -19,6 +20,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Runs of characters not allowed in a sanitized name
+_NON_NAME_CHARS = re.compile(r'[^a-z0-9]+')
+
 
 class SubmissionProcessor:
     """Main processor for handling homework submissions."""
@@ -101,11 +105,10 @@ class SubmissionProcessor:
         Returns:
             Sanitized name safe for git branches
         """
-        import re
         # Convert to lowercase
         name = name.lower()
         # Replace spaces and special chars with hyphens
-        name = re.sub(r'[^a-z0-9]+', '-', name)
+        name = _NON_NAME_CHARS.sub('-', name)
         # Remove leading/trailing hyphens
         name = name.strip('-')
         # Limit length